@@ -1,7 +1,13 @@
 from .config import Config
 from .main import make_cython_extention, make_wrapper, run_setup, write_files
 from .parser import ClangError
-from .typesystem import AbstractTypeConverter, VoidPtrConverter
+from .typesystem import (
+    AbstractTypeConverter,
+    MapViewConverter,
+    NumericVectorListConverter,
+    STLConverter,
+    VoidPtrConverter,
+)
 
 __all__ = [
     "make_cython_extention",
@@ -11,5 +17,8 @@ __all__ = [
     "run_setup",
     "AbstractTypeConverter",
     "VoidPtrConverter",
+    "STLConverter",
+    "MapViewConverter",
+    "NumericVectorListConverter",
     "ClangError",
 ]
@@ -1,6 +1,7 @@
 import os
 import re
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Dict, List, Optional, Tuple
 
 
@@ -25,12 +26,36 @@ class Config:
     global_vars: str = "cvar"
     registered_converters: List[type] = field(default_factory=list)
     renames_dict: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    # explicit instantiations of templates, e.g. ["minusOne<double>", "A<int>"],
+    # bound as `minus_one_double` and `A_int`; the instances of a function
+    # template are also dispatched by a function named after it
+    template_instances: List[str] = field(default_factory=list)
+    # function/method fullname => {argument name: number of elements or None},
+    # a sized `T*` becomes an optional buffer, a `T&`/`T*` scalar is returned
+    output_args: Dict[str, Dict[str, Optional[str]]] = field(default_factory=dict)
+    # "Class::field" => number of elements the pointer field points to, in
+    # terms of the other fields, e.g. {"cholmod_sparse_struct::p": "ncol + 1"}
+    array_fields: Dict[str, str] = field(default_factory=dict)
+    # function/method fullnames and "Class::field"s whose strings are taken
+    # and returned as bytes, without encoding/decoding
+    bytes_strings: List[str] = field(default_factory=list)
+    # function/method fullnames also bound as `<name>_async` coroutines,
+    # running the C++ call on an executor with the GIL released
+    async_functions: List[str] = field(default_factory=list)
+    # "Class::method"s without arguments and "Class::field"s of numeric type
+    # also evaluated over sequences of objects by a `<name>_batch` method
+    batched_members: List[str] = field(default_factory=list)
+    # function fullnames also called over arrays of arguments by a
+    # `<name>_batch` function, in parallel on OpenMP threads
+    parallel_functions: List[str] = field(default_factory=list)
     additional_decls: str = ""
     additional_impls: str = ""
 
     build: bool = True
     cleanup: bool = True
     generate_stub: bool = True
+    # cimportable declarations of the generated extension types
+    generate_pxd: bool = True
 
     setup_filename: str = "setup.py"
     verbose: int = 0
@@ -59,11 +84,40 @@ _STL_MODES_DECL = {
     "shared_ptr": "from libcpp.memory cimport shared_ptr",
 }
 
+# declared in the header's .pxd, used as `cpp.<name>` by the wrappers
+_STL_EXTERN_DECL = {
+    # no libcpp declaration before Cython 3
+    "string_view": """cdef extern from "<string_view>" namespace "std" nogil:
+    cdef cppclass string_view:
+        string_view()
+        string_view(const char *, size_t)
+        const char * data()
+        size_t size()""",
+}
+
 _OTHER_MODS_DECL = {
-    "numpy": "cimport numpy as np\nimport numpy as np",
+    "numpy": "cimport numpy as np\nimport numpy as np\nnp.import_array()",
+    "buffer": "from cpython.buffer cimport PyObject_CheckBuffer",
+    "cython": "cimport cython",
     "deref": "from cython.operator cimport dereference as deref",
-    "malloc": "from libc.stdlib cimport malloc",
+    "inc": "from cython.operator cimport preincrement as inc",
+    "malloc": "from libc.stdlib cimport free, malloc",
+    "memcpy": "from libc.string cimport memcpy",
     "move": "from libcpp.utility cimport move",
+    "mapping": "from collections.abc import ItemsView, KeysView, Mapping, ValuesView",
+    "pybytes": "from cpython.bytes cimport PyBytes_FromString, PyBytes_FromStringAndSize",
+    "pyunicode": "from cpython.unicode cimport PyUnicode_DecodeUTF8",
+    "pycapsule": (
+        "from cpython.pycapsule cimport"
+        " PyCapsule_CheckExact, PyCapsule_GetName, PyCapsule_GetPointer"
+    ),
+    "threading": "import threading",
+    "asyncio": "import asyncio",
+    "copyreg": "import copyreg",
+    "pickle": "import pickle",
+    "numbers": "import numbers",
+    "prange": "from cython.parallel cimport prange",
+    "shared_memory": "from multiprocessing import parent_process, resource_tracker, shared_memory",
 }
 _STL_PATTERN = re.compile(r"std::(\w+)")
 
@@ -74,7 +128,17 @@ class Imports:
     def __init__(self, header_name: str):
         self.header_name = header_name
         self.mods = {mod: False for mod in _OTHER_MODS_DECL}
-        self.stl = {container: False for container in _STL_MODES_DECL}
+        self.stl = {
+            container: False for container in chain(_STL_MODES_DECL, _STL_EXTERN_DECL)
+        }
+        # support code shared by the generated wrappers, e.g. holder classes
+        self.helpers: Dict[str, str] = {}
+        self.helper_stubs: Dict[str, str] = {}
+
+    def add_helper(self, name: str, code: str, stub: str = ""):
+        self.helpers.setdefault(name, code)
+        if stub:
+            self.helper_stubs.setdefault(name, stub)
 
     def add_stl(self, tname: str):
         for match in _STL_PATTERN.finditer(tname):
@@ -86,12 +150,27 @@ class Imports:
     def _stl_import(self):
         includes = ["from libcpp cimport bool"]
         includes += [
-            _STL_MODES_DECL[tname] for tname, cimport in self.stl.items() if cimport
+            _STL_MODES_DECL[tname]
+            for tname, cimport in self.stl.items()
+            if cimport and tname in _STL_MODES_DECL
         ]
         return includes
 
     def declarations_import(self):
-        return os.linesep.join(self._stl_import())
+        includes = self._stl_import()
+        includes += [
+            _STL_EXTERN_DECL[tname]
+            for tname, declare in self.stl.items()
+            if declare and tname in _STL_EXTERN_DECL
+        ]
+        return os.linesep.join(includes)
+
+    def api_import(self):
+        includes = self._stl_import()
+        if self.mods["cython"]:
+            includes.append(_OTHER_MODS_DECL["cython"])
+        includes += [f"cimport {self.header_name} as cpp"]
+        return os.linesep.join(includes)
 
     def implementations_import(self):
         includes = self._stl_import()
@@ -101,3 +180,9 @@ class Imports:
         ]
         includes += [f"cimport {self.header_name} as cpp"]
         return os.linesep.join(includes)
+
+    def implementations_helpers(self):
+        return "".join(os.linesep * 2 + code for code in self.helpers.values())
+
+    def stub_helpers(self):
+        return "".join(os.linesep * 2 + stub for stub in self.helper_stubs.values())
@@ -1,3 +1,4 @@
+from .api import ApiGenerator
 from .decl import DeclGenerator
 from .impl import ImplGenerator
 from .stub import StubGenerator
@@ -0,0 +1,36 @@
+from .impl import BaseImplGenerator
+
+
+class ApiGenerator(BaseImplGenerator):
+    """Declarations of the extension types and cpdef functions (<module>.pxd),
+    so that other Cython modules can cimport them."""
+
+    def generate(self) -> str:
+        self.template_dir = "api"
+        functions = [
+            func.generator.decl
+            for func in self.functions
+            if func.generator.decl is not None
+        ]
+        classes = [
+            self.render(
+                "class",
+                name=class_.name,
+                base=class_.base,
+                final=class_.is_final,
+                methods=[
+                    method.generator.decl
+                    for method in filter(None, [class_.ctor, *class_.methods])
+                    if method.generator.decl is not None
+                ],
+            )
+            for class_ in self.classes
+        ]
+        return self.render(
+            "api",
+            enums=self._generate_enums(),
+            class_names=[class_.name for class_ in self.classes],
+            annexes=self._generate_fused_derives(),
+            classes=classes,
+            functions=functions,
+        )
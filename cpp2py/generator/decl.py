@@ -6,7 +6,7 @@ from ..utils import render
 
 # declaration templates
 TYPEDEF_DECL = """ctypedef %(underlying_type)s %(name)s"""
-FUNC_DECL = """%(ret_type)s %(decl)s(%(args)s) except +"""
+FUNC_DECL = """%(ret_type)s %(decl)s(%(args)s) except +%(nogil)s"""
 CONSTRUCTOR_DECL = "%(class_name)s(%(args)s) except +"
 VAR_DECL = "%(type)s %(decl)s"
 ARG_DECL = "%(type)s %(name)s"
@@ -63,6 +63,7 @@ def process_function(func: Function):
         "ret_type": str(func.ret_type),
         "decl": func.decl,
         "args": _gen_args_decl(func),
+        "nogil": " nogil" if func.is_nogil else "",
     }
 
 
@@ -86,13 +87,14 @@ def process_class(class_: Class):
             "ret_type": str(method.ret_type),
             "decl": method.decl,
             "args": _gen_args_decl(method),
+            "nogil": " nogil" if method.is_nogil else "",
         }
         if method.is_static:
             mgen = f"@staticmethod{os.linesep}{mgen}"
         methods.append(mgen)
 
     class_decl = {
-        "name": class_.name,
+        "name": class_.decl,
         "fields": fields,
         "ctors": ctors,
         "methods": methods,
@@ -2,7 +2,7 @@ import os
 from typing import Callable
 
 from ..config import Config
-from ..process import ProcessOutput
+from ..process import BindedClass, ProcessOutput
 from ..utils import render
 
 
@@ -58,27 +58,52 @@ class BaseImplGenerator:
                     methods=methods,
                     fields=fields,
                     name=class_.name,
+                    base=class_.base,
+                    final=class_.is_final,
+                    record=class_.name in self.typenames.records,
+                    declared=self.config.generate_pxd,
+                    pickle=self._generate_pickle(class_),
                 )
             )
         return globals, functions, classes
 
+    def _generate_pickle(self, class_: BindedClass):
+        if class_.pickle is None:
+            return None
+        return render(
+            os.path.join("impl", "pickle"),
+            name=class_.name,
+            mode=class_.pickle,
+            fields=class_.pickled_fields,
+        )
+
+    def _generate_enums(self):
+        return [render(os.path.join("impl", "enum"), enum=enum) for enum in self.enums]
+
+    def _generate_fused_derives(self):
+        return os.linesep.join(
+            render(
+                os.path.join("impl", "fused_derives"),
+                name=class_name,
+                derived=sorted(derived),
+                fused_name=self.typenames.get_fused_name(class_name),
+            )
+            for class_name in self.typenames.derives
+            if (derived := self.typenames.get_fused_derives(class_name))
+        )
+
 
 class ImplGenerator(BaseImplGenerator):
     def generate(self) -> str:
         self.template_dir = "impl"
-        enums = [self.render("enum", enum=enum) for enum in self.enums]
         globals, functions, classes = super()._generate_func_class(
             lambda generator: getattr(generator, "impl")
         )
-        fused_derives = os.linesep.join(
-            self.render(
-                "fused_derives",
-                name=class_name,
-                derived=derived,
-                fused_name=self.typenames.get_fused_name(class_name),
-            )
-            for class_name, derived in self.typenames.derives.items()
-        )
+        # enums and fused types are declared in the module's .pxd if there is one
+        enums, fused_derives = [], ""
+        if not self.config.generate_pxd:
+            enums = self._generate_enums()
+            fused_derives = self._generate_fused_derives()
 
         return self.render(
             "definitions",
@@ -6,7 +6,7 @@ from typing import List, Optional
 import black
 
 from .config import Config, Imports
-from .generator import DeclGenerator, ImplGenerator, StubGenerator
+from .generator import ApiGenerator, DeclGenerator, ImplGenerator, StubGenerator
 from .parser import parse
 from .process import Postprocessor
 from .typesystem import init_converters
@@ -25,12 +25,17 @@ class WrapperResult:
     stub_content: Optional[str] = None
     stub_name: Optional[str] = None
 
+    api_content: Optional[str] = None
+    api_name: Optional[str] = None
+
     def __iter__(self):
         yield self.header_name, self.header_content
         yield self.source_name, self.source_content
         yield self.setup_name, self.setup_content
         if self.stub_name is not None:
             yield self.stub_name, self.stub_content
+        if self.api_name is not None:
+            yield self.api_name, self.api_content
 
 
 def _derive_modname(headers: List[str]):
@@ -66,7 +71,10 @@ def make_wrapper(config: Config):
     # add modules import
     pxd_content = includes.declarations_import() + pxd_content + config.additional_decls
     pyx_content = (
-        includes.implementations_import() + pyx_content + config.additional_impls
+        includes.implementations_import()
+        + includes.implementations_helpers()
+        + pyx_content
+        + config.additional_impls
     )
 
     # generate setup
@@ -83,6 +91,7 @@ def make_wrapper(config: Config):
         compiler_flags=config.compiler_flags,
         library_dirs=config.library_dirs,
         libraries=config.libraries,
+        openmp=includes.mods["prange"],
     )
 
     results = WrapperResult(
@@ -94,11 +103,18 @@ def make_wrapper(config: Config):
         config.setup_filename,
     )
 
+    # generate module PXD (optional)
+    if config.generate_pxd:
+        results.api_name = f"{config.modulename}.pxd"
+        results.api_content = (
+            includes.api_import() + ApiGenerator(process_ret, config).generate()
+        )
+
     # generate PYI (optional)
     if config.generate_stub:
         results.stub_name = f"{config.modulename}.pyi"
         results.stub_content = black.format_str(
-            StubGenerator(process_ret, config).generate(),
+            StubGenerator(process_ret, config).generate() + includes.stub_helpers(),
             mode=black.FileMode(is_pyi=True),
         )
 
@@ -130,9 +146,11 @@ def make_cython_extention(config: Config):
     if config.cleanup:
         targets = [
             results.source_name,
-            results.header_name,
             results.setup_name,
             results.source_name.replace(".pyx", ".cpp"),
         ]
+        # the module .pxd cimports the header .pxd
+        if results.api_name is None:
+            targets.append(results.header_name)
         for file in targets:
             os.remove(file)
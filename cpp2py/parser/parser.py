@@ -1,7 +1,8 @@
 import os
 import re
+from dataclasses import dataclass
 from itertools import count, tee
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 from warnings import warn
 
 from clang import cindex
@@ -24,11 +25,14 @@ from .parser_types import (
 )
 from .utils import (
     OPERATORS_MAPPER,
+    instance_name,
     is_operator,
     join_namespace,
     parse_literal_cursor,
     parse_literal_str,
     split_namespace,
+    split_template_instance,
+    substitute_template_args,
     unary_operators,
 )
 
@@ -58,6 +62,73 @@ def is_ignored_method(cur: Cursor):
     )
 
 
+def is_plain_data(cur: Cursor):
+    """Standard layout and trivially copyable, approximately"""
+    if cur.type.is_pod():
+        return True
+    for ac in cur.get_children():
+        if (
+            ac.kind in {CursorKind.CXX_BASE_SPECIFIER, CursorKind.DESTRUCTOR}
+            or (ac.kind == CursorKind.CXX_METHOD and ac.is_virtual_method())
+            or (
+                ac.kind == CursorKind.CONSTRUCTOR
+                and (ac.is_copy_constructor() or ac.is_move_constructor())
+            )
+            or (
+                ac.kind == CursorKind.FIELD_DECL
+                and ac.access_specifier != cindex.AccessSpecifier.PUBLIC
+            )
+        ):
+            return False
+    return True
+
+
+_TEMPLATE_PARAM_KINDS = {
+    CursorKind.TEMPLATE_TYPE_PARAMETER,
+    CursorKind.TEMPLATE_NON_TYPE_PARAMETER,
+}
+TEMPLATE_ALIAS_PREFIX = "__cpp2py_t"
+
+
+@dataclass
+class TemplateInstance:
+    """A template of the headers with arguments, see Config.template_instances"""
+
+    cursor: Cursor
+    namespace: str
+    name: str  # of the wrapper
+    # e.g. `ns::A<int>`, qualified as Cython does not qualify C names
+    cppname: str
+    args: Dict[str, str]  # template parameter => argument
+
+    def types(self) -> Iterator[str]:
+        """spellings of the types of the declarations bound"""
+        if self.cursor.kind == CursorKind.FUNCTION_TEMPLATE:
+            decls = [self.cursor]
+        else:
+            decls = [
+                ac
+                for ac in self.cursor.get_children()
+                if ac.kind
+                in {
+                    CursorKind.FIELD_DECL,
+                    CursorKind.CXX_METHOD,
+                    CursorKind.CONSTRUCTOR,
+                }
+            ]
+        for decl in decls:
+            if decl.kind == CursorKind.FIELD_DECL:
+                yield decl.type.spelling
+                continue
+            yield decl.result_type.spelling
+            for ac in decl.get_children():
+                if ac.kind == CursorKind.PARM_DECL:
+                    yield ac.type.spelling
+
+    def alias_key(self, typename: str) -> Tuple[str, str]:
+        return self.namespace, substitute_template_args(typename, self.args)
+
+
 def set_when_missing(dic: dict, symbol):
     if symbol.name in dic:
         warn(
@@ -76,11 +147,19 @@ class ClangParser:
         self.objects = ParseResult()
         self.includes = includes
         self.cxxtypes: Dict[str, CXXType] = {}
+        # fullname => cursor and namespace of the templates
+        self.templates: Dict[str, Tuple[Cursor, str]] = {}
+        # (namespace, type of an instance) => its alias
+        self.template_aliases: Dict[Tuple[str, str], str] = {}
+        # type in a template => the type of the instance being processed
+        self.template_types: Optional[Dict[str, cindex.Type]] = None
 
     def get_filename(self, cur: Cursor):
         return self.fmapper[cur.location.file.name]
 
     def build_cxxtype(self, type: cindex.Type):
+        if self.template_types is not None:
+            type = self.template_types.get(type.spelling, type)
         return CXXType.build(type, self.includes, self.cxxtypes)
 
     def parse(self):
@@ -122,6 +201,77 @@ class ClangParser:
                 self._process_typedef(cur, namespace)
             elif cur.kind == CursorKind.VAR_DECL:
                 self._process_variable(cur, namespace)
+            elif cur.kind in {CursorKind.CLASS_TEMPLATE, CursorKind.FUNCTION_TEMPLATE}:
+                fullname = join_namespace(namespace, cur.spelling)
+                self.templates.setdefault(fullname, (cur, namespace))
+
+    def template_instances(self, instances: List[str]) -> List[TemplateInstance]:
+        ret = []
+        for instance in instances:
+            split = split_template_instance(instance)
+            if split is None or split[0] not in self.templates:
+                warn(f"Ignoring template instance {instance}: template not found")
+                continue
+            template, args = split
+            cur, namespace = self.templates[template]
+            params = [
+                ac.spelling
+                for ac in cur.get_children()
+                if ac.kind in _TEMPLATE_PARAM_KINDS
+            ]
+            if len(params) != len(args):
+                warn(
+                    f"Ignoring template instance {instance}: expected {len(params)} arguments"
+                )
+                continue
+            ret.append(
+                TemplateInstance(
+                    cur,
+                    namespace,
+                    instance_name(template, args),
+                    f"{template}<{', '.join(args)}>",
+                    dict(zip(params, args)),
+                )
+            )
+        return ret
+
+    def template_aliases_source(self, instances: List[TemplateInstance]) -> str:
+        """`using` declarations naming the types of the instances, for clang to
+        resolve them"""
+        lines = []
+        for instance in instances:
+            for typename in instance.types():
+                key = instance.alias_key(typename)
+                if key in self.template_aliases:
+                    continue
+                alias = f"{TEMPLATE_ALIAS_PREFIX}{len(self.template_aliases)}"
+                self.template_aliases[key] = alias
+                line = f"using {alias} = {key[1]};"
+                for namespace in reversed(key[0].split("::") if key[0] else []):
+                    line = f"namespace {namespace} {{ {line} }}"
+                lines.append(line)
+        return os.linesep.join(lines)
+
+    def instantiate(self, instances: List[TemplateInstance], cursor: Cursor):
+        """bind the instances, with the types of the aliases parsed in `cursor`"""
+        alias_types = {
+            ac.spelling: ac.underlying_typedef_type
+            for ac in cursor.walk_preorder()
+            if ac.kind == CursorKind.TYPE_ALIAS_DECL
+            and ac.spelling.startswith(TEMPLATE_ALIAS_PREFIX)
+        }
+        for instance in instances:
+            self.template_types = {
+                typename: alias_types[
+                    self.template_aliases[instance.alias_key(typename)]
+                ]
+                for typename in instance.types()
+            }
+            if instance.cursor.kind == CursorKind.FUNCTION_TEMPLATE:
+                self._process_function(instance.cursor, "", instance)
+            else:
+                self._process_class(instance.cursor, instance)
+        self.template_types = None
 
     def _process_variable(self, cur: Cursor, namespace: str):
         if cur.semantic_parent != cur.lexical_parent:
@@ -152,20 +302,28 @@ class ClangParser:
             var.value = self._parse_var_literal(tokens[1])
         func.args.append(var)
 
-    def _process_function(self, cur: Cursor, namespace: str):
+    def _process_function(
+        self, cur: Cursor, namespace: str, instance: Optional[TemplateInstance] = None
+    ):
         if is_operator(cur.spelling):
             # only support operator overloading in methods
             return
         arg_counter = count()
         func = Function(
-            name=cur.spelling,
+            name=cur.spelling if instance is None else instance.name,
             filename=self.get_filename(cur),
             namespace=namespace,
             type=cur.type.spelling,
             ret_type=self.build_cxxtype(cur.result_type),
             is_variadic=cur.type.is_function_variadic(),
         )
-        for ac in cur.get_arguments():
+        args = cur.get_arguments()
+        if instance is not None:
+            func.old_name = instance.cppname
+            func.template = cur.spelling
+            func.type = substitute_template_args(func.type, instance.args)
+            args = (ac for ac in cur.get_children() if ac.kind == CursorKind.PARM_DECL)
+        for ac in args:
             self._process_parameter(ac, func, f"arg{next(arg_counter)}")
         self.objects.functions[func.name].append(func)
 
@@ -201,24 +359,40 @@ class ClangParser:
         )
         set_when_missing(self.objects.enums, enum)
 
-    def _process_class(self, cur: Cursor):
-        class_namespace, class_name = split_namespace(cur.type.spelling)
+    def _process_class(self, cur: Cursor, instance: Optional[TemplateInstance] = None):
+        if instance is None:
+            class_namespace, class_name = split_namespace(cur.type.spelling)
+            child_namespace = cur.type.spelling
+        else:
+            class_namespace, class_name = "", instance.name
+            child_namespace = instance.cppname
         class_ = Class(
             name=class_name,
             filename=self.get_filename(cur),
             namespace=class_namespace,
             is_abstract=cur.is_abstract_record(),
+            is_plain_data=is_plain_data(cur),
         )
-        self._process_class_children(cur, class_)
+        if instance is not None:
+            class_.old_name = instance.cppname
+        self._process_class_children(cur, class_, child_namespace, instance is None)
         set_when_missing(self.objects.classes, class_)
 
-    def _process_class_children(self, cur: Cursor, class_: Class):
-        child_namespace = cur.type.spelling
+    def _process_class_children(
+        self, cur: Cursor, class_: Class, child_namespace: str, nested: bool = True
+    ):
+        """`nested`: also process the nested declarations, and the bases"""
         for ac in cur.get_children():
-            if ac.kind == CursorKind.CXX_BASE_SPECIFIER:
+            if ac.kind == CursorKind.CXX_BASE_SPECIFIER and not nested:
+                # of dependent types, their members are not bound
+                class_.has_hidden_fields = True
+            elif ac.kind == CursorKind.CXX_BASE_SPECIFIER:
                 if ac.access_specifier != cindex.AccessSpecifier.PUBLIC:
+                    class_.has_hidden_fields = True
                     continue
-                class_.bases.add(ac.type.spelling)
+                class_.bases.append(ac.type.spelling)
+                if any(token.spelling == "virtual" for token in ac.get_tokens()):
+                    class_.virtual_bases.add(ac.type.spelling)
             elif ac.kind == CursorKind.CXX_METHOD:
                 self._process_method(ac, class_, child_namespace)
             elif ac.kind == CursorKind.CONSTRUCTOR:
@@ -228,8 +402,11 @@ class ClangParser:
                     ac.access_specifier != cindex.AccessSpecifier.PUBLIC
                     or ac.is_anonymous()
                 ):
+                    class_.has_hidden_fields = True
                     continue
                 self._process_field(ac, class_)
+            elif not nested:
+                continue
             elif ac.kind == CursorKind.VAR_DECL:
                 if (
                     ac.access_specifier != cindex.AccessSpecifier.PUBLIC
@@ -333,6 +510,8 @@ class ClangParser:
 def parse(config: Config, includes: Imports):
     args = [
         "-Wno-pragma-once-outside-header",
+        # the standard of the extension's build, see setup.j2
+        "-std=c++17",
         f"-I{CLANG_INCDIR}",
         *[f"-I{include}" for include in config.incdirs],
         *[flag for flag in config.libclang_flags],
@@ -364,4 +543,19 @@ def parse(config: Config, includes: Imports):
 
     parser = ClangParser(root.cursor, headers_mapper, includes)
     ret = parser.parse()
+
+    if config.template_instances:
+        instances = parser.template_instances(config.template_instances)
+        # the types of the instances are resolved by clang, in a second pass
+        unsaved_files[0][1] = os.linesep.join(
+            [dummy_content, parser.template_aliases_source(instances)]
+        )
+        aliases = idx.parse(
+            path=dummy_name,
+            args=args,
+            unsaved_files=unsaved_files,
+            options=cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES,
+        )
+        _check_diagnostics(aliases.diagnostics)
+        parser.instantiate(instances, aliases.cursor)
     return ret
@@ -49,6 +49,10 @@ class Variable(_BaseSymbol):
 
     value: object = None  # default value
 
+    # written by the function, see Config.output_args
+    is_output: bool = False
+    output_size: str | None = None
+
 
 @dataclass
 class Function(_BaseSymbol):
@@ -56,6 +60,10 @@ class Function(_BaseSymbol):
     ret_type: CXXType = None
     args: list[Variable] = field(default_factory=list)
     is_variadic: bool = False  # C variadic parameter like "int printf(char *, ...)"
+    # the function template of an instance, see Config.template_instances
+    template: str = ""
+    # called without the GIL, see Config.async_functions
+    is_nogil: bool = False
 
 
 @dataclass
@@ -96,10 +104,15 @@ class Class(Record):
     ctors: list[Method] = field(default_factory=list)
     fields: list[Variable] = field(default_factory=list)
 
-    bases: set[str] = field(default_factory=set)
+    bases: list[str] = field(default_factory=list)
+    virtual_bases: set[str] = field(default_factory=set)
     is_abstract: bool = False
+    # can be viewed as a record of a structured array
+    is_plain_data: bool = False
     # Whether there is an implicitly generated default constructor
     auto_default_constructible: bool = True
+    # data members not bound, e.g. private ones or those of private bases
+    has_hidden_fields: bool = False
 
 
 @dataclass
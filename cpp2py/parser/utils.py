@@ -2,7 +2,7 @@ import operator
 import re
 from ast import literal_eval
 from functools import lru_cache
-from typing import Any, Callable, Dict, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from clang.cindex import CursorKind
 
@@ -26,6 +26,37 @@ def split_namespace(namespace: str):
     return "::".join(names[:-1]), names[-1]
 
 
+_INSTANCE_PATTERN = re.compile(r"^\s*([\w:]+)\s*<(.*)>\s*$")
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def split_template_instance(instance: str) -> Optional[Tuple[str, List[str]]]:
+    """`ns::A<int, std::pair<int, int>>` => `ns::A`, `["int", "std::pair<int, int>"]`"""
+    match = _INSTANCE_PATTERN.match(instance)
+    if match is None:
+        return None
+    args = [""]
+    depth = 0
+    for char in match.group(2):
+        if char == "," and depth == 0:
+            args.append("")
+            continue
+        depth += {"<": 1, "(": 1, ">": -1, ")": -1}.get(char, 0)
+        args[-1] += char
+    return match.group(1), [arg.strip() for arg in args]
+
+
+def instance_name(template: str, args: List[str]) -> str:
+    """Python name of a template instance, e.g. `A<unsigned int>` => `A_unsigned_int`"""
+    words = _WORD_PATTERN.findall(" ".join(args))
+    return "_".join([split_namespace(template)[1], *words])
+
+
+def substitute_template_args(typename: str, args: Dict[str, str]) -> str:
+    """`const T &` => `const int &`"""
+    return _WORD_PATTERN.sub(lambda m: args.get(m.group(0), m.group(0)), typename)
+
+
 @lru_cache
 def is_operator(name: str) -> bool:
     return _OPERATOR_PATTERN.match(name) is not None
@@ -1 +1 @@
-from .postprocess import Postprocessor, ProcessOutput
+from .postprocess import BindedClass, Postprocessor, ProcessOutput
@@ -1,26 +1,71 @@
 import os
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+from clang.cindex import TypeKind
 
 from ..config import Imports
 from ..parser import Variable
-from ..typesystem import BaseTypeConverter, CXXType, TypeNames, create_type_converter
+from ..typesystem import (
+    BATCH_INDEX,
+    BaseTypeConverter,
+    NUMERIC_TYPEKINDS,
+    CXXType,
+    TypeNames,
+    create_array_view_converter,
+    create_batch_converter,
+    create_bytes_converter,
+    create_output_converter,
+    create_type_converter,
+    npy_typenum,
+)
 from ..utils import PostInitMeta, camel_to_snake, render
 
 # member definitions
 FUNC_CALL = "cpp.%(name)s(%(call_args)s)"
-CONSTRUCTOR_CALL = "self.thisptr = new cpp.%(class_name)s(%(call_args)s)"
-METHOD_CALL = "self.thisptr.%(name)s(%(call_args)s)"
+CONSTRUCTOR_CALL = "self.thisptr = %(cast)snew cpp.%(class_name)s(%(call_args)s)"
+METHOD_CALL = "%(thisptr)s.%(name)s(%(call_args)s)"
 STATIC_METHOD_CALL = "cpp.%(class_name)s.%(name)s(%(call_args)s)"
 SETTER_CALL = "%(prefix)s.%(name)s = %(call_args)s"
 GETTER_CALL = "%(prefix)s.%(name)s"
 
 PYSIGN = "def %(name)s(%(args)s) -> %(ret_type)s: ..."
+DECL = "%(def_prefix)s %(name)s(%(args)s)"
+FAST_PATH_PREFIX = "cdef inline"
+FAST_PATH_NAME = "_c_%(name)s"
+DEF_WRAPPER = "def %(name)s(%(args)s):\n    return self.%(fast_name)s(%(call_args)s)"
+ASYNC_NAME = "%(name)s_async"
+NOGIL_NAME = "_%(name)s_nogil"
+NOGIL_RESULT = "_c_result"
+BATCH_NAME = "%(name)s_batch"
+BATCH_PYSIGN = (
+    "def %(name)s(objects: Iterable[%(class_name)s],"
+    " out: np.ndarray[Any, np.dtype[%(pytype)s]] | None = None,"
+    " num_threads: int = 1) -> np.ndarray[Any, np.dtype[%(pytype)s]]: ..."
+)
+PARALLEL_PYSIGN = (
+    "def %(name)s(%(args)s%(out)snum_threads: int = 1) -> %(ret_type)s: ..."
+)
+OVERLOAD_NAME = "_%(name)s_%(index)d"
+ASYNC_PYSIGN = (
+    "async def %(name)s(%(args)s*, executor: Executor | None = None)"
+    " -> %(ret_type)s: ..."
+)
+
+THISPTR = "self.thisptr"
+# derived wrappers store the pointer with the type of their root base class
+DERIVED_THISPTR = "(<cpp.%(class_name)s *> self.thisptr)"
 
 VOID = object()
 AUTO = object()
 
 
+def get_thisptr(typenames: TypeNames, class_name: str):
+    if typenames.get_root(class_name) == class_name:
+        return THISPTR
+    return DERIVED_THISPTR % {"class_name": class_name}
+
+
 class _VoidConverter(BaseTypeConverter):
     def __init__(self):
         ...
@@ -28,6 +73,9 @@ class _VoidConverter(BaseTypeConverter):
     def return_output(self, cpp_call: str, **kwargs) -> str:
         return cpp_call
 
+    def return_result(self, cpp_call: str, **kwargs):
+        return cpp_call, None
+
     def pysign_type_decl(self, is_parameter):
         return "None"
 
@@ -45,15 +93,28 @@ class FunctionGenerator(metaclass=PostInitMeta):
         ret_type: CXXType,
         typenames: TypeNames,
         includes: Imports,
+        bytes_strings: bool = False,
     ) -> None:
         def get_converter(type: CXXType, py_argname: str):
+            if bytes_strings:
+                return create_bytes_converter(type, py_argname, typenames, includes)
             return create_type_converter(type, py_argname, typenames, includes)
 
+        def get_arg_converter(arg: Variable):
+            if arg.is_output:
+                return create_output_converter(
+                    arg.type, arg.name, arg.output_size, typenames, includes
+                )
+            return get_converter(arg.type, arg.name)
+
         self.name = name
         self.args = args
         self.typenames = typenames
 
-        self.arg_converters = [get_converter(arg.type, arg.name) for arg in args]
+        self.arg_converters = [get_arg_converter(arg) for arg in args]
+        self.output_converters = [
+            tc for tc, arg in zip(self.arg_converters, args) if arg.is_output
+        ]
         if ret_type == VOID:
             self.ret_converter = _VoidConverter()
         elif ret_type == AUTO:
@@ -65,6 +126,7 @@ class FunctionGenerator(metaclass=PostInitMeta):
     def __post_init__(self):
         self.impl = self.generate_impl()
         self.pysign = self.generate_pysign()
+        self.decl = self.generate_decl()
 
     def _function_name(self):
         return camel_to_snake(self.name)
@@ -72,17 +134,29 @@ class FunctionGenerator(metaclass=PostInitMeta):
     def _function_prefix(self):
         return "cpdef"
 
-    def _input_args(self):
+    def _python_args(self):
+        """converters and default values of the Python parameters,
+        output buffers are optional and come last"""
+        args = [
+            (tc, arg.value)
+            for tc, arg in zip(self.arg_converters, self.args)
+            if not arg.is_output
+        ]
+        args += [(tc, "None") for tc in self.output_converters if tc.is_parameter]
+        return args
+
+    def _input_args(self, is_decl: bool = False):
+        python_args = self._python_args()
         args = [
             f"{self.typenames.get_fused_name(tc.input_type_decl())} {tc.py_argname}"
-            for tc in self.arg_converters
+            for tc, _ in python_args
         ]
         # handle default values
         for idx in reversed(range(len(args))):
-            arg = self.args[idx]
-            if arg.value is None:
+            value = python_args[idx][1]
+            if value is None:
                 break
-            args[idx] += f" = {arg.value}"
+            args[idx] += "=*" if is_decl else f" = {value}"
         return ", ".join(args)
 
     def _cpp_call(self, args: str):
@@ -92,41 +166,100 @@ class FunctionGenerator(metaclass=PostInitMeta):
         }
 
     def generate_impl(self):
+        return self._render_impl(self._function_name(), self._function_prefix())
+
+    def _render_impl(self, name: str, def_prefix: str, nogil: bool = False):
+        """`nogil`: the C++ call is made with the GIL released, its result
+        is stored in a variable whose type is inferred"""
         input_conversions = [tc.python_to_cpp() for tc in self.arg_converters]
         cpp_call_args = ", ".join(tc.cpp_call_arg() for tc in self.arg_converters)
         cpp_call = self._cpp_call(cpp_call_args)
 
+        nogil_call = None
+        if nogil:
+            nogil_call = cpp_call
+            cpp_call = ""
+            if (
+                self.ret_converter.return_output(NOGIL_RESULT, copy=True)
+                != NOGIL_RESULT
+            ):
+                nogil_call = f"{NOGIL_RESULT} = {nogil_call}"
+                cpp_call = NOGIL_RESULT
+
         return render(
             "impl/function",
             **{
-                "name": self._function_name(),
-                "def_prefix": self._function_prefix(),
+                "name": name,
+                "def_prefix": def_prefix,
                 "args": self._input_args(),
                 "input_conversions": input_conversions,
-                "return_output": self.ret_converter.return_output(
-                    cpp_call, copy=self.ret_copy
-                ),
+                "nogil_call": nogil_call,
+                "return_output": self._return_output(cpp_call),
             },
         )
 
+    def _return_output(self, cpp_call: str):
+        after_call = [code for tc in self.arg_converters if (code := tc.after_call())]
+        if not after_call and not self.output_converters:
+            return self.ret_converter.return_output(cpp_call, copy=self.ret_copy)
+        statements, result = self.ret_converter.return_result(
+            cpp_call, copy=self.ret_copy
+        )
+        # void results are replaced by the outputs
+        values = [result] if result is not None else []
+        values += [tc.output_value() for tc in self.output_converters]
+        if not values:
+            return os.linesep.join(filter(None, [statements, *after_call]))
+        return os.linesep.join(
+            filter(
+                None,
+                [
+                    statements,
+                    f"__result = {', '.join(values)}",
+                    *after_call,
+                    "return __result",
+                ],
+            )
+        )
+
     def _pysign_input_args(self):
+        python_args = self._python_args()
         args = [
-            f"{tc.py_argname}: {tc.pysign_type_decl(True)}"
-            for tc in self.arg_converters
+            f"{tc.py_argname}: {tc.pysign_type_decl(True)}" for tc, _ in python_args
         ]
         # handle default values
         for idx in reversed(range(len(args))):
-            arg = self.args[idx]
-            if arg.value is None:
+            value = python_args[idx][1]
+            if value is None:
                 break
-            args[idx] += f" = {arg.value}"
+            args[idx] += f" = {value}"
         return ", ".join(args)
 
+    def _pysign_ret_type(self):
+        ret_types = [tc.pysign_type_decl(False) for tc in self.output_converters]
+        if not ret_types:
+            return self.ret_converter.pysign_type_decl(False)
+        if self.ret_converter.pysign_type_decl(False) != "None":
+            ret_types.insert(0, self.ret_converter.pysign_type_decl(False))
+        if len(ret_types) == 1:
+            return ret_types[0]
+        return f"tuple[{', '.join(ret_types)}]"
+
     def generate_pysign(self):
         return PYSIGN % {
             "name": self._function_name(),
             "args": self._pysign_input_args(),
-            "ret_type": self.ret_converter.pysign_type_decl(False),
+            "ret_type": self._pysign_ret_type(),
+        }
+
+    def generate_decl(self):
+        """declaration in the module's .pxd, None for def functions"""
+        if self._function_prefix() != "cpdef":
+            return None
+        return DECL % {
+            "def_prefix": self._function_prefix(),
+            "name": self._function_name(),
+            "args": self._input_args(is_decl=True),
         }
 
 
@@ -142,23 +275,70 @@ class MethodGenerator(FunctionGenerator):
         typenames: TypeNames,
         includes: Imports,
         class_name: str,
+        is_override: bool = False,
+        bytes_strings: bool = False,
     ) -> None:
-        super().__init__(name, args, ret_type, typenames, includes)
+        super().__init__(name, args, ret_type, typenames, includes, bytes_strings)
         self.class_name = class_name
         self.is_operator = _MAGIC_METHOD_PATTERN.match(name) is not None
+        # overrides a cpdef method of the base extension type
+        self.is_override = is_override
 
     def _function_prefix(self):
         return "def" if self.is_operator else "cpdef"
 
     def _cpp_call(self, args: str):
-        return METHOD_CALL % {"name": self.name, "call_args": args}
+        return METHOD_CALL % {
+            "thisptr": get_thisptr(self.typenames, self.class_name),
+            "name": self.name,
+            "call_args": args,
+        }
 
-    def _input_args(self):
-        args = super()._input_args()
+    def _input_args(self, is_decl: bool = False):
+        args = super()._input_args(is_decl)
         if args != "":
             return f"{self.class_name} self, {args}"
         return f"{self.class_name} self"
 
+    def _has_fast_path(self):
+        """Methods of final wrappers are split into a cdef inline method,
+        called directly from Cython, and a def wrapper without override check."""
+        return (
+            self._function_prefix() == "cpdef"
+            and not self.is_override
+            and self.typenames.is_final(self.class_name)
+            and all(
+                self.typenames.get_fused_name(tc.input_type_decl())
+                == tc.input_type_decl()
+                for tc, _ in self._python_args()
+            )
+        )
+
+    def generate_impl(self):
+        if not self._has_fast_path():
+            return super().generate_impl()
+        fast_name = FAST_PATH_NAME % {"name": self._function_name()}
+        wrapper = DEF_WRAPPER % {
+            "name": self._function_name(),
+            "args": self._input_args(),
+            "fast_name": fast_name,
+            "call_args": ", ".join(tc.py_argname for tc, _ in self._python_args()),
+        }
+        fast_path = self._render_impl(fast_name, FAST_PATH_PREFIX)
+        return os.linesep.join([fast_path, "", wrapper])
+
+    def generate_decl(self):
+        if self.is_override:
+            # declared by the base extension type
+            return None
+        if not self._has_fast_path():
+            return super().generate_decl()
+        return DECL % {
+            "def_prefix": FAST_PATH_PREFIX,
+            "name": FAST_PATH_NAME % {"name": self._function_name()},
+            "args": self._input_args(is_decl=True),
+        }
+
     def _pysign_input_args(self):
         args = super()._pysign_input_args()
         if args != "":
@@ -177,8 +357,8 @@ class StaticMethodGenerator(MethodGenerator):
             "call_args": args,
         }
 
-    def _input_args(self):
-        return FunctionGenerator._input_args(self)
+    def _input_args(self, is_decl: bool = False):
+        return FunctionGenerator._input_args(self, is_decl)
 
     def _pysign_input_args(self):
         return FunctionGenerator._pysign_input_args(self)
@@ -197,14 +377,25 @@ class ConstructorGenerator(MethodGenerator):
         typenames: TypeNames,
         includes: Imports,
         class_name: str,
+        bytes_strings: bool = False,
     ) -> None:
-        super().__init__("__init__", args, VOID, typenames, includes, class_name)
+        super().__init__(
+            "__init__",
+            args,
+            VOID,
+            typenames,
+            includes,
+            class_name,
+            bytes_strings=bytes_strings,
+        )
 
     def _function_prefix(self):
         return "def"
 
     def _cpp_call(self, args: str):
+        root = self.typenames.get_root(self.class_name)
         return CONSTRUCTOR_CALL % {
+            "cast": "" if root == self.class_name else f"<cpp.{root} *>",
             "class_name": self.class_name,
             "call_args": args,
         }
@@ -219,10 +410,25 @@ class GetterGenerator(MethodGenerator):
         includes: Imports,
         class_name: str,
         prefix: str,
+        size: Optional[str] = None,
+        bytes_strings: bool = False,
     ) -> None:
-        super().__init__(field_name, [], field_type, typenames, includes, class_name)
+        super().__init__(
+            field_name,
+            [],
+            field_type,
+            typenames,
+            includes,
+            class_name,
+            bytes_strings=bytes_strings,
+        )
         self.ret_copy = False
         self.prefix = prefix
+        if size is not None:
+            # pointer field of `size` elements
+            self.ret_converter = create_array_view_converter(
+                field_type, field_name, size, typenames, includes
+            )
 
     def _function_prefix(self):
         return "def"
@@ -246,6 +452,7 @@ class SetterGenerator(MethodGenerator):
         includes: Imports,
         class_name: str,
         prefix: str,
+        bytes_strings: bool = False,
     ) -> None:
         super().__init__(
             field_name,
@@ -254,6 +461,7 @@ class SetterGenerator(MethodGenerator):
             typenames,
             includes,
             class_name,
+            bytes_strings=bytes_strings,
         )
         self.prefix = prefix
 
@@ -269,3 +477,565 @@ class SetterGenerator(MethodGenerator):
             "name": self.name,
             "call_args": args,
         }
+
+
+class LenGenerator(MethodGenerator):
+    """`__len__` of a container-like class, from its `size()` method"""
+
+    def __init__(
+        self,
+        size_name: str,
+        size_type: CXXType,
+        typenames: TypeNames,
+        includes: Imports,
+        class_name: str,
+    ) -> None:
+        super().__init__(size_name, [], size_type, typenames, includes, class_name)
+        self.is_operator = True
+
+    def _function_name(self):
+        return "__len__"
+
+    def _pysign_ret_type(self):
+        return "int"
+
+
+class SequenceGetItemGenerator(MethodGenerator):
+    """Bounds checked `__getitem__` of a container-like class, from its
+    `operator[]` and `size()`, slices of numbers stored contiguously (given
+    by `data()`) are ndarrays viewing them."""
+
+    def __init__(
+        self,
+        ret_type: CXXType,
+        typenames: TypeNames,
+        includes: Imports,
+        class_name: str,
+        size_name: str,
+        data_name: Optional[str] = None,
+    ) -> None:
+        super().__init__("__getitem__", [], ret_type, typenames, includes, class_name)
+        self.size_name = size_name
+        self.data_name = data_name
+        self.typenum = None
+        if data_name is not None:
+            includes.mods["numpy"] = True
+            ele_type = ret_type.get_canonical()
+            if ele_type.pointee is not None:  # returned by reference
+                ele_type = ele_type.pointee.get_canonical()
+            self.typenum = npy_typenum(ele_type.kind)
+
+    def generate_impl(self):
+        return render(
+            "impl/sequence_getitem",
+            class_name=self.class_name,
+            thisptr=get_thisptr(self.typenames, self.class_name),
+            size=self.size_name,
+            data=self.data_name,
+            typenum=self.typenum,
+            return_output=self._return_output(self._cpp_call("idx")),
+        )
+
+    def generate_pysign(self):
+        item_type = self._pysign_ret_type()
+        slice_type = "np.ndarray" if self.typenum else f"list[{item_type}]"
+        return os.linesep.join(
+            [
+                "@overload",
+                f"def __getitem__(self, index: int) -> {item_type}: ...",
+                "@overload",
+                f"def __getitem__(self, index: slice) -> {slice_type}: ...",
+            ]
+        )
+
+
+class IterGenerator(MethodGenerator):
+    """`__iter__` of a container-like class, driving the pointers returned
+    by its `begin()` and `end()`, wrapped classes are yielded as views"""
+
+    def __init__(
+        self,
+        begin_name: str,
+        end_name: str,
+        ptr_type: CXXType,
+        typenames: TypeNames,
+        includes: Imports,
+        class_name: str,
+    ) -> None:
+        ele_type = ptr_type.get_canonical().pointee
+        super().__init__(begin_name, [], ele_type, typenames, includes, class_name)
+        self.is_operator = True
+        self.end_name = end_name
+        if ptr_type.kind != TypeKind.POINTER:
+            ptr_type = ptr_type.get_canonical()
+        self.ptr_type = ptr_type.name
+        self.element = self.item = None
+        if ele_type.plain_name in typenames.classes:
+            self.element = ele_type.plain_name
+            const = "const " if ele_type.type.is_const_qualified() else ""
+            self.ptr_type = f"{const}cpp.{self.element} *"
+        else:
+            try:
+                statements, self.item = self.ret_converter.return_result(
+                    "deref(it)", copy=True
+                )
+            except NotImplementedError:
+                statements, self.item = "", None
+            if statements or self.item is None:
+                raise NotImplementedError(
+                    "Unsupported: iterating over this element type"
+                )
+            includes.mods["deref"] = True
+        includes.mods["inc"] = True
+
+    def _function_name(self):
+        return "__iter__"
+
+    def generate_impl(self):
+        return render(
+            "impl/sequence_iter",
+            class_name=self.class_name,
+            thisptr=get_thisptr(self.typenames, self.class_name),
+            ptr_type=self.ptr_type,
+            begin=self.name,
+            end=self.end_name,
+            item=self.item,
+            element=self.element,
+            root=self.element and self.typenames.get_root(self.element),
+        )
+
+    def generate_pysign(self):
+        return f"def __iter__(self) -> Iterator[{self._pysign_ret_type()}]: ..."
+
+
+# Python objects converted implicitly by Cython when passed to the C++ call
+_IMPLICIT_CONVERSION_DECLS = {"object", "str", "bytes", "bytearray"}
+
+
+class AsyncGenerator:
+    """`<name>_async` coroutine of a function or method, running it on an
+    executor (the loop's default one when None) through a worker releasing
+    the GIL during the C++ call. The worker holds the arguments, and thus
+    pins their buffers, until the call returns: cancelling the coroutine
+    raises CancelledError at once, a call already started runs to its end."""
+
+    def __init__(self, generator: FunctionGenerator, includes: Imports) -> None:
+        for tc in generator.arg_converters:
+            if (
+                tc.cpp_call_arg() == tc.py_argname
+                and tc.input_type_decl() in _IMPLICIT_CONVERSION_DECLS
+            ):
+                raise NotImplementedError(
+                    f"Unsupported: releasing the GIL with argument '{tc.py_argname}'"
+                )
+        includes.mods["asyncio"] = True
+        includes.mods["cython"] = True
+        self.generator = generator
+        self.is_static = isinstance(generator, StaticMethodGenerator)
+        self.is_method = isinstance(generator, MethodGenerator)
+        self.impl = self.generate_impl()
+        self.pysign = self.generate_pysign()
+        self.decl = None
+
+    def _names(self):
+        name = self.generator._function_name()
+        return ASYNC_NAME % {"name": name}, NOGIL_NAME % {"name": name}
+
+    def generate_impl(self):
+        name, worker_name = self._names()
+        worker = self.generator._render_impl(worker_name, "def", nogil=True)
+        worker_ref = worker_name
+        if self.is_static:
+            worker_ref = f"{self.generator.class_name}.{worker_name}"
+        elif self.is_method:
+            worker_ref = f"self.{worker_name}"
+
+        python_args = self.generator._python_args()
+        args = [
+            tc.py_argname if value is None else f"{tc.py_argname}={value}"
+            for tc, value in python_args
+        ]
+        if self.is_method and not self.is_static:
+            args.insert(0, "self")
+        return render(
+            "impl/async",
+            name=name,
+            static=self.is_static,
+            worker=worker,
+            worker_ref=worker_ref,
+            args="".join(f"{arg}, " for arg in args),
+            call_args=[tc.py_argname for tc, _ in python_args],
+        )
+
+    def generate_pysign(self):
+        args = self.generator._pysign_input_args()
+        pysign = ASYNC_PYSIGN % {
+            "name": self._names()[0],
+            "args": f"{args}, " if args else "",
+            "ret_type": self.generator._pysign_ret_type(),
+        }
+        if self.is_static:
+            return f"@staticmethod{os.linesep}{pysign}"
+        return pysign
+
+
+class BatchGenerator:
+    """`<name>_batch` static method, evaluating a method without arguments
+    or a field of numeric type over a sequence of wrapped objects in a C loop
+    (a prange releasing the GIL), into a preallocated ndarray"""
+
+    def __init__(
+        self,
+        name: str,
+        value_type: CXXType,
+        typenames: TypeNames,
+        includes: Imports,
+        class_name: str,
+        is_method: bool,
+    ) -> None:
+        """`name`: of the member in the declarations"""
+        value_type = value_type.get_canonical()
+        if value_type.kind in (TypeKind.LVALUEREFERENCE, TypeKind.RVALUEREFERENCE):
+            value_type = value_type.pointee.get_canonical()
+        if value_type.kind not in NUMERIC_TYPEKINDS or value_type.kind == TypeKind.BOOL:
+            raise NotImplementedError("Unsupported: batching non numeric values")
+        includes.mods["numpy"] = True
+        includes.mods["prange"] = True
+        includes.stl["vector"] = True
+        self.name = name
+        self.class_name = class_name
+        self.value = f"{name}()" if is_method else name
+        self.ctype = value_type.plain_name
+        self.typenum = npy_typenum(value_type.kind)
+        self.pytype = NUMERIC_TYPEKINDS[value_type.kind]
+        self.impl = self.generate_impl()
+        self.pysign = self.generate_pysign()
+        self.decl = None
+
+    def _function_name(self):
+        # named like the method or the property
+        name = camel_to_snake(self.name) if self.value.endswith(")") else self.name
+        return BATCH_NAME % {"name": name}
+
+    def generate_impl(self):
+        return render(
+            "impl/batch",
+            name=self._function_name(),
+            class_name=self.class_name,
+            value=self.value,
+            ctype=self.ctype,
+            typenum=self.typenum,
+        )
+
+    def generate_pysign(self):
+        return os.linesep.join(
+            [
+                "@staticmethod",
+                BATCH_PYSIGN
+                % {
+                    "name": self._function_name(),
+                    "class_name": self.class_name,
+                    "pytype": self.pytype,
+                },
+            ]
+        )
+
+
+class ParallelGenerator:
+    """`<name>_batch` function, calling a function over arrays of arguments
+    in a prange releasing the GIL, on `num_threads` OpenMP threads: one by
+    default, since the function may not be thread-safe, their default
+    number (e.g. OMP_NUM_THREADS) when 0. The arrays are checked
+    to match before the loop, which runs without bounds checking. Numeric
+    results are written into a preallocated ndarray."""
+
+    def __init__(
+        self,
+        name: str,
+        args: List[Variable],
+        ret_type: CXXType,
+        typenames: TypeNames,
+        includes: Imports,
+    ) -> None:
+        if not args:
+            raise NotImplementedError(
+                "Unsupported: batching functions without arguments"
+            )
+        if any(arg.is_output for arg in args):
+            raise NotImplementedError("Unsupported: batching output arguments")
+        if any(arg.name in ("out", "num_threads") for arg in args):
+            raise NotImplementedError(
+                "Unsupported: batching arguments named like the parameters"
+            )
+        ret_type = ret_type.get_canonical()
+        if ret_type.kind in (TypeKind.LVALUEREFERENCE, TypeKind.RVALUEREFERENCE):
+            ret_type = ret_type.pointee.get_canonical()
+        if ret_type.kind != TypeKind.VOID and (
+            ret_type.kind not in NUMERIC_TYPEKINDS or ret_type.kind == TypeKind.BOOL
+        ):
+            raise NotImplementedError("Unsupported: batching non numeric results")
+        self.arg_converters = [
+            create_batch_converter(arg.type, arg.name, typenames, includes)
+            for arg in args
+        ]
+        includes.mods["cython"] = True
+        includes.mods["numpy"] = True
+        includes.mods["prange"] = True
+        self.name = name
+        self.ret_type = ret_type
+        self.impl = self.generate_impl()
+        self.pysign = self.generate_pysign()
+        self.decl = None
+
+    def _function_name(self):
+        return BATCH_NAME % {"name": camel_to_snake(self.name)}
+
+    def generate_impl(self):
+        call = FUNC_CALL % {
+            "name": self.name,
+            "call_args": ", ".join(tc.cpp_call_arg() for tc in self.arg_converters),
+        }
+        ctype = typenum = None
+        if self.ret_type.kind != TypeKind.VOID:
+            call = f"out[{BATCH_INDEX}] = {call}"
+            ctype = self.ret_type.plain_name
+            typenum = npy_typenum(self.ret_type.kind)
+        return render(
+            "impl/parallel",
+            name=self._function_name(),
+            args="".join(
+                f"{tc.input_type_decl()} {tc.py_argname}, "
+                for tc in self.arg_converters
+            ),
+            input_conversions=[tc.python_to_cpp() for tc in self.arg_converters],
+            sizes=[(tc.py_argname, tc.size()) for tc in self.arg_converters],
+            ctype=ctype,
+            typenum=typenum,
+            index=BATCH_INDEX,
+            call=call,
+        )
+
+    def generate_pysign(self):
+        out = ""
+        ret_type = "None"
+        if self.ret_type.kind != TypeKind.VOID:
+            ret_type = (
+                f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.ret_type.kind]}]]"
+            )
+            out = f"out: {ret_type} | None = None, "
+        return PARALLEL_PYSIGN % {
+            "name": self._function_name(),
+            "args": "".join(
+                f"{tc.py_argname}: {tc.pysign_type_decl(True)}, "
+                for tc in self.arg_converters
+            ),
+            "out": out,
+            "ret_type": ret_type,
+        }
+
+
+_ARRAY_PYSIGN_PATTERN = re.compile(r"np\.ndarray\[Any, np\.dtype\[([\w.]+)\]\]")
+
+
+def _overload_check(pysign: str, typenames: TypeNames) -> str:
+    """`(exact types, types of the same kind, types after conversion, dtype)`
+    of a parameter, from its Python type"""
+    if pysign == "bool":
+        # `bool` is cimported from libcpp
+        return "((type(True),), (type(True), np.bool_), numbers.Integral, None)"
+    if pysign.startswith("np.float"):
+        return "((float,), (float, np.floating), numbers.Real, None)"
+    if pysign.startswith(("np.int", "np.uint")):
+        return "((int,), numbers.Integral, numbers.Integral, None)"
+    if pysign in ("str", "bytes") or pysign in typenames.classes:
+        return f"(({pysign},), {pysign}, {pysign}, None)"
+    if (match := _ARRAY_PYSIGN_PATTERN.fullmatch(pysign)) is not None:
+        return f"((), object, object, np.dtype({match.group(1)}))"
+    return "((), object, object, None)"
+
+
+def _exact_check(pysign: str, typenames: TypeNames, value: str) -> Optional[str]:
+    """condition on `value` having exactly the Python type of a parameter,
+    None if the parameter has no exact type"""
+    if pysign == "bool":
+        return f"({value} is True or {value} is False)"
+    if pysign.startswith("np.float"):
+        return f"type({value}) is float"
+    if pysign.startswith(("np.int", "np.uint")):
+        return f"type({value}) is int"
+    if pysign in ("str", "bytes") or pysign in typenames.classes:
+        return f"type({value}) is {pysign}"
+    if (match := _ARRAY_PYSIGN_PATTERN.fullmatch(pysign)) is not None:
+        typenum = f"np.NPY_{match.group(1).split('.')[-1].rstrip('_').upper()}"
+        return (
+            f"(type({value}) is np.ndarray"
+            f" and np.PyArray_TYPE(<np.ndarray> {value}) == {typenum})"
+        )
+    return None
+
+
+class OverloadGenerator:
+    """Dispatcher of overloaded functions, methods or constructors, each bound
+    as a cpdef function under an internal name. Positional arguments of the
+    exact types of an overload (ndarrays by dtype) select it by their
+    number and a type check each, and it is called at C level. Keywords
+    and arguments taken after conversion are resolved by the first
+    overload taking the exact types, else the first one taking numbers of
+    their kind (integers for integer parameters), else the first one
+    taking them, and cached per argument types."""
+
+    def __init__(
+        self,
+        generators: List[FunctionGenerator],
+        includes: Imports,
+        name: Optional[str] = None,
+    ):
+        """`name`: of the dispatcher, when the overloads are bound under
+        their own names, the one of the overloads by default"""
+        includes.mods["cython"] = True
+        includes.mods["numbers"] = True
+        includes.mods["numpy"] = True
+        includes.add_helper("_resolve_overload", render("overload_helpers"))
+        self.generators = generators
+        self.first = generators[0]
+        self.is_bound = name is not None
+        self.name = name or self.first._function_name()
+        self.is_static = isinstance(self.first, StaticMethodGenerator)
+        self.is_method = isinstance(self.first, MethodGenerator)
+        self.is_ctor = isinstance(self.first, ConstructorGenerator)
+        self.class_name = self.first.class_name if self.is_method else ""
+        prefix = f"{self.class_name}_" if self.is_method else ""
+        self.cache = f"_{prefix}{self.name.strip('_')}_overloads"
+        # the overloads resolved per argument types
+        includes.add_helper(self.cache, f"cdef dict {self.cache} = {{}}")
+        self.impl = self.generate_impl()
+        self.pysign = self.generate_pysign()
+        self.decl = self.generate_decl()
+
+    def _overload_name(self, index: int):
+        if self.is_bound:
+            return self.generators[index]._function_name()
+        name = self.name.strip("_")
+        if self.is_ctor:
+            # not overriding the constructors of the base extension type
+            name = f"{self.class_name}_{name}"
+        return OVERLOAD_NAME % {"name": name, "index": index}
+
+    def _callee(self, index: int):
+        if self.is_static:
+            return f"{self.class_name}.{self._overload_name(index)}"
+        if self.is_method:
+            return f"self.{self._overload_name(index)}"
+        return self._overload_name(index)
+
+    def _spec(self, index: int, generator: FunctionGenerator):
+        python_args = generator._python_args()
+        required = 0
+        while required < len(python_args) and python_args[required][1] is None:
+            required += 1
+        func = self._overload_name(index)
+        if self.is_method:
+            # the Python method, Cython does not convert C methods with
+            # optional arguments
+            func = f"(<object> {self.class_name}).{func}"
+        return {
+            "func": func,
+            "names": repr(tuple(tc.py_argname for tc, _ in python_args)),
+            "required": required,
+            "checks": "".join(
+                f"{_overload_check(tc.pysign_type_decl(True), generator.typenames)}, "
+                for tc, _ in python_args
+            ),
+        }
+
+    def _fast_paths(self):
+        """`(number of arguments, [(condition, call)])`, the overloads taking
+        that many positional arguments of exact types, in order"""
+        paths: Dict[int, List[Tuple[str, str]]] = {}
+        for index, generator in enumerate(self.generators):
+            python_args = generator._python_args()
+            if self.is_static or any(
+                generator.typenames.get_fused_name(tc.input_type_decl())
+                != tc.input_type_decl()
+                for tc, _ in python_args
+            ):
+                # fused specialisations are resolved by Cython
+                continue
+            checks = [
+                _exact_check(
+                    tc.pysign_type_decl(True), generator.typenames, f"args[{idx}]"
+                )
+                for idx, (tc, _) in enumerate(python_args)
+            ]
+            required = 0
+            while required < len(python_args) and python_args[required][1] is None:
+                required += 1
+            for nargs in range(required, len(python_args) + 1):
+                if None in checks[:nargs]:
+                    break
+                call_args = ", ".join(f"args[{idx}]" for idx in range(nargs))
+                paths.setdefault(nargs, []).append(
+                    (
+                        " and ".join(checks[:nargs]),
+                        f"{self._callee(index)}({call_args})",
+                    )
+                )
+        return sorted(paths.items())
+
+    def generate_impl(self):
+        overloads = []
+        for index, generator in enumerate(self.generators):
+            if self.is_bound:
+                continue
+            overload = generator._render_impl(self._overload_name(index), "cpdef")
+            # called with the keyword arguments, even when taking one argument
+            overload = f"@cython.always_allow_keywords(True){os.linesep}{overload}"
+            if self.is_static:
+                overload = f"@staticmethod{os.linesep}{overload}"
+            overloads.append(overload)
+        is_bound = self.is_method and not self.is_static
+        return render(
+            "impl/overload",
+            overloads=overloads,
+            static=self.is_static,
+            name=self.name,
+            self_arg=f"{self.class_name} self, " if is_bound else "",
+            call_self="self, " if is_bound else "",
+            returns=not self.is_ctor,
+            fast_paths=self._fast_paths(),
+            cache=self.cache,
+            specs=[
+                self._spec(index, generator)
+                for index, generator in enumerate(self.generators)
+            ],
+        )
+
+    def generate_decl(self):
+        """declarations of the overloads in the module's .pxd"""
+        if self.is_bound or self.is_static or getattr(self.first, "is_override", False):
+            # bound under their own names, or declared by the base extension type
+            return None
+        return os.linesep.join(
+            DECL
+            % {
+                "def_prefix": "cpdef",
+                "name": self._overload_name(index),
+                "args": generator._input_args(is_decl=True),
+            }
+            for index, generator in enumerate(self.generators)
+        )
+
+    def _pysign(self, generator: FunctionGenerator):
+        if generator._function_name() == self.name:
+            return generator.pysign
+        return PYSIGN % {
+            "name": self.name,
+            "args": generator._pysign_input_args(),
+            "ret_type": generator._pysign_ret_type(),
+        }
+
+    def generate_pysign(self):
+        return os.linesep.join(
+            f"@overload{os.linesep}{self._pysign(generator)}"
+            for generator in self.generators
+        )
@@ -1,26 +1,90 @@
+import re
 import warnings
 from dataclasses import dataclass, field
 from functools import partial
 from itertools import chain
-from typing import Callable, List, Optional, Set, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+from clang.cindex import TypeKind
 from more_itertools import flatten
 
 from ..config import Config, Imports
 from ..parser import Class, Function, Macro, Method, ParseResult, Variable
-from ..typesystem import TypeNames
-from ..utils import toposort
+from ..typesystem import NUMERIC_TYPEKINDS, CXXType, TypeNames, dtype_format
+from ..utils import camel_to_snake, render, toposort
 from .func import (
     AUTO,
+    AsyncGenerator,
+    BatchGenerator,
     ConstructorGenerator,
     FunctionGenerator,
     GetterGenerator,
+    IterGenerator,
+    LenGenerator,
     MethodGenerator,
+    OverloadGenerator,
+    ParallelGenerator,
+    SequenceGetItemGenerator,
     SetterGenerator,
     StaticMethodGenerator,
+    get_thisptr,
 )
 
 
+_IDENTIFIER_PATTERN = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+_INDEX_TYPEKINDS = {
+    TypeKind.SHORT,
+    TypeKind.USHORT,
+    TypeKind.INT,
+    TypeKind.UINT,
+    TypeKind.LONG,
+    TypeKind.ULONG,
+    TypeKind.LONGLONG,
+    TypeKind.ULONGLONG,
+}
+_CONTAINER_MEMBERS = ("size", "__getitem__", "data", "begin", "end")
+_SHARED_ARRAY_HELPERS = """# element count and size, before the elements of a `<name>SharedArray`
+cdef Py_ssize_t _SHARED_HEADER = 64
+# names of the blocks created by this process
+cdef set _SHARED_CREATED = set()
+
+
+cdef _attach_shared_memory(str name):
+    \"\"\"only the creator unlinks the block\"\"\"
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    # before Python 3.13, attaching registers the block with the resource
+    # tracker, which unlinks it when exiting. The creator and its
+    # multiprocessing children share one tracker, in which the creator
+    # registered it; other processes unregister it from their own
+    shm = shared_memory.SharedMemory(name)
+    if shm._name not in _SHARED_CREATED and parent_process() is None:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _attach_shared_array(cls, name, readonly):
+    \"\"\"unpickles a `<name>SharedArray` by attaching to its block\"\"\"
+    return cls.attach(name, readonly)"""
+
+
+def _value_type(type: CXXType) -> CXXType:
+    """canonical type, without reference"""
+    type = type.get_canonical()
+    if type.kind in (TypeKind.LVALUEREFERENCE, TypeKind.RVALUEREFERENCE):
+        return type.pointee.get_canonical()
+    return type
+
+
+def _same_signature(m1: Method, m2: Method):
+    def signature(m: Method):
+        return m.is_static, [(arg.type.name, arg.value is None) for arg in m.args]
+
+    return signature(m1) == signature(m2)
+
+
 @dataclass
 class BindedFunc:
     func: Function
@@ -37,9 +101,15 @@ class BindedVar:
 @dataclass
 class BindedClass:
     name: str
+    base: Optional[str] = None
+    is_final: bool = False
     ctor: Optional[BindedFunc] = None
     methods: List[BindedFunc] = field(default_factory=list)
     fields: List[BindedVar] = field(default_factory=list)
+    # "bytes" (memcpy of a trivially copyable object), "fields" (through
+    # the properties) or "unsupported" (hides the pickling of the base)
+    pickle: Optional[str] = None
+    pickled_fields: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -64,7 +134,9 @@ class Postprocessor:
     def generate_output(self):
         self.output = ProcessOutput(self.objects, self.typenames)
         self._rename_symbols()
+        self._mark_output_args()
         self._handle_inheritance()
+        self._derive_records()
         self._bind_generators()
         return self.output
 
@@ -92,8 +164,22 @@ class Postprocessor:
                     newname = namedict[key]
             func.name = newname
 
+    def _mark_output_args(self):
+        def functions(objects: ParseResult):
+            yield from chain(*objects.functions.values())
+            for class_ in objects.classes.values():
+                yield from chain(*class_.methods.values())
+
+        for func in functions(self.objects):
+            outputs = self.config.output_args.get(func.fullname, {})
+            for arg in func.args:
+                if arg.old_name in outputs:
+                    arg.is_output = True
+                    arg.output_size = outputs[arg.old_name]
+
     def _handle_inheritance(self):
-        """Copies methods/fields from base classes to subclasses."""
+        """Copies methods/fields from base classes to subclasses,
+        and picks the base extension type of each wrapper."""
         class_dict = {node.name: node for node in self.objects.classes.values()}
         dep_map = {
             class_.name: {class_dict[name].name for name in class_.bases}
@@ -109,6 +195,7 @@ class Postprocessor:
                 for method_name, methods in superclass.methods.items():
                     if method_name not in class_.methods.keys():
                         class_.methods[method_name].extend(methods)
+                class_.has_hidden_fields |= superclass.has_hidden_fields
                 class_fields = {field.name for field in class_.fields}
                 class_.fields.extend(
                     field
@@ -116,8 +203,29 @@ class Postprocessor:
                     if field.name not in class_fields
                 )
 
+        def _cython_base(class_: Class):
+            """the single non-virtual base, if its wrapper methods can be shared"""
+            # casting the root pointer is only safe along single non-virtual bases
+            if len(class_.bases) != 1 or class_.bases[0] in class_.virtual_bases:
+                return None
+            base = class_dict[class_.bases[0]]
+            for method_name, methods in class_.methods.items():
+                base_methods = base.methods.get(method_name)
+                if not base_methods or base_methods[0] is methods[0]:
+                    continue
+                # an override must keep the signatures of the cpdef methods,
+                # the overloads of a dispatcher included
+                if len(base_methods) != len(methods) or not all(
+                    map(_same_signature, base_methods, methods)
+                ):
+                    return None
+            return base.name
+
         for class_name in flatten(topoorders):
-            _copy_from_supers(class_dict[class_name])
+            class_ = class_dict[class_name]
+            _copy_from_supers(class_)
+            if (base_name := _cython_base(class_)) is not None:
+                self.typenames.parents[class_name] = base_name
 
         for class_name in flatten(reversed(topoorders)):
             for superclass_name in dep_map[class_name]:
@@ -125,13 +233,68 @@ class Postprocessor:
                 derives.add(class_name)
                 derives |= self.typenames.derives.get(class_name, set())
 
+    def _derive_records(self):
+        """NumPy structured dtypes of plain data classes,
+        whose fields are numbers, fixed-size arrays or records"""
+        candidates = [
+            class_
+            for class_ in self.objects.classes.values()
+            if class_.is_plain_data and class_.fields
+        ]
+        derived = True
+        while derived:  # records nested in records come first
+            derived = False
+            for class_ in candidates:
+                if class_.name in self.typenames.records:
+                    continue
+                formats = [
+                    dtype_format(field.type, self.typenames.records)
+                    for field in class_.fields
+                ]
+                if None in formats:
+                    continue
+                self.typenames.records.add(class_.name)
+                self.includes.mods["numpy"] = True
+                self.includes.mods["malloc"] = True
+                self.includes.add_helper(
+                    f"_{class_.name}_dtype",
+                    render(
+                        "record_dtype",
+                        name=class_.name,
+                        fields=[
+                            {"name": field.name, "format": format}
+                            for field, format in zip(class_.fields, formats)
+                        ],
+                    ),
+                )
+                if not class_.has_hidden_fields:
+                    self._add_shared_array(class_.name)
+                derived = True
+
+    def _add_shared_array(self, name: str):
+        """`<name>SharedArray`, elements of a record in shared memory"""
+        self.includes.mods["shared_memory"] = True
+        self.includes.mods["malloc"] = True
+        self.includes.mods["memcpy"] = True
+        self.includes.add_helper("_shared_array", _SHARED_ARRAY_HELPERS)
+        array = f"{name}SharedArray"
+        self.includes.add_helper(
+            array,
+            render("shared_array", array=array, name=name),
+            stub=render("shared_array_stub", array=array, name=name),
+        )
+
     def _bind_overloaded_functions(
         self, funcs: List[Function], generator_builder: Callable[..., FunctionGenerator]
     ):
-        names: Set[str] = set()
-        ret = []
+        """bind the functions by name, overloads of a name are resolved by
+        a generated dispatcher, except for operators and static methods
+        (whose overloads Cython does not resolve)"""
+        overloads: Dict[str, List[Tuple[Function, FunctionGenerator]]] = {}
         for func in funcs:
-            if func.name in names:
+            if func.name in overloads and (
+                getattr(func, "is_operator", False) or getattr(func, "is_static", False)
+            ):
                 warnings.warn(
                     f"Ignoring overloaded {func.__class__.__name__}: {func.fullname}"
                 )
@@ -141,10 +304,69 @@ class Postprocessor:
             except NotImplementedError as err:
                 warnings.warn(f"{err} ignoring '{func.fullname}'")
             else:
-                ret.append((func, generator))
-                names.add(func.name)
+                overloads.setdefault(func.name, []).append((func, generator))
+
+        ret = []
+        for fun_gens in overloads.values():
+            func, generator = fun_gens[0]
+            if len(fun_gens) > 1:
+                generator = OverloadGenerator(
+                    [generator for _, generator in fun_gens], self.includes
+                )
+            ret.append((func, generator))
         return ret
 
+    def _bind_template_dispatchers(
+        self, instances: Dict[str, List[Tuple[Function, FunctionGenerator]]]
+    ):
+        """a dispatcher named after each function template with several
+        instances, over them"""
+        names = {camel_to_snake(name) for name in self.objects.functions}
+        for template, fun_gens in instances.items():
+            name = camel_to_snake(template)
+            generators = [generator for _, generator in fun_gens]
+            if len(generators) < 2:
+                continue
+            if name in names or any(
+                isinstance(generator, OverloadGenerator) for generator in generators
+            ):
+                warnings.warn(f"Ignoring the dispatcher of the instances of {template}")
+                continue
+            generator = OverloadGenerator(generators, self.includes, name)
+            self.output.functions.append(BindedFunc(fun_gens[0][0], generator))
+
+    def _bind_async(self, func: Function, generator: FunctionGenerator):
+        """`<name>_async` coroutine of the functions in Config.async_functions"""
+        if func.fullname not in self.config.async_functions:
+            return None
+        if isinstance(generator, OverloadGenerator):
+            warnings.warn(
+                f"Unsupported: overloaded coroutines ignoring '{func.fullname}'"
+                " async variant"
+            )
+            return None
+        try:
+            async_generator = AsyncGenerator(generator, self.includes)
+        except NotImplementedError as err:
+            warnings.warn(f"{err} ignoring '{func.fullname}' async variant")
+            return None
+        func.is_nogil = True
+        return BindedFunc(func, async_generator)
+
+    def _bind_parallel(self, func: Function):
+        """`<name>_batch` of the functions in Config.parallel_functions"""
+        if func.fullname not in self.config.parallel_functions:
+            return None
+        try:
+            generator = ParallelGenerator(
+                func.name, func.args, func.ret_type, self.typenames, self.includes
+            )
+        except NotImplementedError as err:
+            warnings.warn(f"{err} ignoring '{func.fullname}' batched variant")
+            return None
+        func.is_nogil = True
+        return BindedFunc(func, generator)
+
     def _bind_var(self, var: Union[Variable, Macro], class_name: str, is_field: bool):
         if isinstance(var, Macro):
             vtype = AUTO
@@ -152,10 +374,20 @@ class Postprocessor:
         else:
             vtype = var.type
             no_setter = var.type.get_canonical().type.is_const_qualified()
-        prefix = "self.thisptr" if is_field else "cpp"
+        prefix = get_thisptr(self.typenames, class_name) if is_field else "cpp"
+        size = self._array_field_size(var, class_name, prefix) if is_field else None
+        fullname = f"{class_name}::{var.old_name}" if is_field else var.fullname
+        bytes_strings = fullname in self.config.bytes_strings
         try:
             getter = GetterGenerator(
-                var.name, vtype, self.typenames, self.includes, class_name, prefix
+                var.name,
+                vtype,
+                self.typenames,
+                self.includes,
+                class_name,
+                prefix,
+                size,
+                bytes_strings,
             )
         except NotImplementedError as err:
             warnings.warn(f"{err} ignoring field '{var.name}'")
@@ -170,12 +402,27 @@ class Postprocessor:
                     self.includes,
                     class_name,
                     prefix,
+                    bytes_strings,
                 )
             except NotImplementedError as err:
                 warnings.warn(f"{err} ignoring field '{var.name}' setter")
         return BindedVar(var.name, getter, setter)
 
-    def _method_builder(self, m: Method, class_name: str):
+    def _array_field_size(self, var: Variable, class_name: str, prefix: str):
+        """Config.array_fields's size expression of a pointer field,
+        with the other fields read from the C++ object"""
+        size = self.config.array_fields.get(f"{class_name}::{var.old_name}")
+        if size is None:
+            return None
+        fields = {f.old_name: f.name for f in self.objects.classes[class_name].fields}
+
+        def read_field(match: re.Match):
+            name = match.group(0)
+            return f"{prefix}.{fields[name]}" if name in fields else name
+
+        return _IDENTIFIER_PATTERN.sub(read_field, size)
+
+    def _method_builder(self, m: Method, class_name: str, is_override: bool):
         builder = StaticMethodGenerator if m.is_static else MethodGenerator
         return builder(
             m.name,
@@ -184,6 +431,8 @@ class Postprocessor:
             self.typenames,
             self.includes,
             class_name,
+            is_override,
+            m.fullname in self.config.bytes_strings,
         )
 
     def _bind_generators(self):
@@ -194,25 +443,62 @@ class Postprocessor:
                 self.output.vars.append(bvar)
 
         # bind functions
+        instances: Dict[str, List[Tuple[Function, FunctionGenerator]]] = {}
         for funcs in self.objects.functions.values():
             ret = self._bind_overloaded_functions(
                 funcs,
                 lambda func: FunctionGenerator(
-                    func.name, func.args, func.ret_type, self.typenames, self.includes
+                    func.name,
+                    func.args,
+                    func.ret_type,
+                    self.typenames,
+                    self.includes,
+                    func.fullname in self.config.bytes_strings,
                 ),
             )
             for fun_gen in ret:
                 self.output.functions.append(BindedFunc(*fun_gen))
+                if (async_func := self._bind_async(*fun_gen)) is not None:
+                    self.output.functions.append(async_func)
+                if (batch_func := self._bind_parallel(fun_gen[0])) is not None:
+                    self.output.functions.append(batch_func)
+                if fun_gen[0].template:
+                    instances.setdefault(fun_gen[0].template, []).append(fun_gen)
+        self._bind_template_dispatchers(instances)
 
+        binded_classes: Dict[str, BindedClass] = {}
+        # name => property, of the fields bound by each class and its bases
+        binded_fields: Dict[str, Dict[str, BindedVar]] = {}
         for class_ in self.objects.classes.values():
-            bclass = BindedClass(class_.name)
+            bclass = BindedClass(
+                class_.name,
+                self.typenames.parents.get(class_.name),
+                self.typenames.is_final(class_.name),
+            )
+            if bclass.is_final:
+                self.includes.mods["cython"] = True
+            base = self.objects.classes.get(bclass.base)
 
             # build functions
-            method_builder = partial(self._method_builder, class_name=class_.name)
-            for methods in class_.methods.values():
+            protocols = self._container_protocols(class_, base)
+            for method_name, methods in class_.methods.items():
+                if method_name in protocols:
+                    continue
+                inherited = base is not None and method_name in base.methods
+                if inherited and base.methods[method_name][0] is methods[0]:
+                    # shared with the base extension type
+                    continue
+                method_builder = partial(
+                    self._method_builder,
+                    class_name=class_.name,
+                    is_override=inherited,
+                )
                 ret = self._bind_overloaded_functions(methods, method_builder)
                 for fun_gen in ret:
                     bclass.methods.append(BindedFunc(*fun_gen))
+                    if (async_func := self._bind_async(*fun_gen)) is not None:
+                        bclass.methods.append(async_func)
+            bclass.methods += [func for func in protocols.values() if func is not None]
 
             # build constructor
             ctors = []
@@ -224,16 +510,198 @@ class Postprocessor:
             ret = self._bind_overloaded_functions(
                 ctors,
                 lambda ctor: ConstructorGenerator(
-                    ctor.args, self.typenames, self.includes, class_.name
+                    ctor.args,
+                    self.typenames,
+                    self.includes,
+                    class_.name,
+                    ctor.fullname in self.config.bytes_strings,
                 ),
             )
             if ret:
-                bclass.ctor = BindedFunc(*ret[0])
+                ctor, generator = ret[0]
+                if isinstance(generator, OverloadGenerator):
+                    # the one called without arguments, e.g. by unpickling
+                    ctor = next(
+                        (c for c in ctors if all(a.value is not None for a in c.args)),
+                        ctor,
+                    )
+                bclass.ctor = BindedFunc(ctor, generator)
 
             # build fields
             for field in class_.fields:
+                if base is not None and any(field is f for f in base.fields):
+                    continue
                 bfield = self._bind_var(field, class_.name, True)
                 if bfield is not None:
                     bclass.fields.append(bfield)
 
+            bclass.methods += self._bind_batches(class_)
+
+            bbase = binded_classes.get(bclass.base)
+            fields = dict(binded_fields.get(bclass.base, {}))
+            fields.update((bfield.name, bfield) for bfield in bclass.fields)
+            self._bind_pickling(class_, bclass, bbase, fields)
+            binded_classes[class_.name] = bclass
+            binded_fields[class_.name] = fields
+
             self.output.classes.append(bclass)
+
+    def _bind_batches(self, class_: Class):
+        """`<name>_batch` of the members in Config.batched_members"""
+        members = []
+        for methods in class_.methods.values():
+            method = methods[0]
+            if f"{class_.name}::{method.old_name}" not in self.config.batched_members:
+                continue
+            if method.is_static or method.args:
+                warnings.warn(
+                    "Unsupported: batching methods with arguments"
+                    f" ignoring '{method.fullname}' batched variant"
+                )
+                continue
+            members.append((method, method.ret_type, True))
+        for field in class_.fields:
+            if f"{class_.name}::{field.old_name}" in self.config.batched_members:
+                members.append((field, field.type, False))
+
+        ret = []
+        for member, value_type, is_method in members:
+            try:
+                generator = BatchGenerator(
+                    member.name,
+                    value_type,
+                    self.typenames,
+                    self.includes,
+                    class_.name,
+                    is_method,
+                )
+            except NotImplementedError as err:
+                warnings.warn(
+                    f"{err} ignoring '{class_.name}::{member.old_name}' batched variant"
+                )
+                continue
+            if is_method:
+                member.is_nogil = True
+            ret.append(BindedFunc(member, generator))
+        return ret
+
+    def _bind_pickling(
+        self,
+        class_: Class,
+        bclass: BindedClass,
+        base: Optional[BindedClass],
+        fields: Dict[str, BindedVar],
+    ):
+        """Trivially copyable records are pickled as their bytes, other classes
+        field by field if their properties hold the whole state and they can
+        be built without arguments"""
+        if class_.name in self.typenames.records and not class_.has_hidden_fields:
+            bclass.pickle = "bytes"
+            for mod in ("copyreg", "pickle", "malloc", "memcpy"):
+                self.includes.mods[mod] = True
+            return
+
+        ctor = bclass.ctor
+        if (
+            class_.has_hidden_fields
+            or ctor is None
+            or any(arg.value is None for arg in ctor.func.args)
+            or any(
+                field.name not in fields or fields[field.name].setter is None
+                # the memory pointed to is not part of the state
+                or _value_type(field.type).kind == TypeKind.POINTER
+                for field in class_.fields
+            )
+        ):
+            if base is not None and base.pickle in ("bytes", "fields"):
+                bclass.pickle = "unsupported"
+            return
+        bclass.pickle = "fields"
+        bclass.pickled_fields = [field.name for field in class_.fields]
+
+    def _container_protocols(self, class_: Class, base: Optional[Class]):
+        """`__len__`, bounds checked `__getitem__` and `__iter__` of classes with
+        `size()`, `operator[]` and `begin()`/`end()` returning pointers, by the
+        methods they replace (None for the methods dropped)"""
+        protocols: Dict[str, Optional[BindedFunc]] = {}
+
+        def member(name: str):
+            methods = class_.methods.get(name, [])
+            return methods[0] if methods else None
+
+        if base is not None and all(
+            member(name) is (base.methods.get(name) or [None])[0]
+            for name in _CONTAINER_MEMBERS
+        ):
+            # shared with the base extension type
+            return protocols
+
+        def accessor(name: str):
+            method = member(name)
+            if method is None or method.is_static or method.args:
+                return None
+            return method
+
+        size = accessor("size")
+        if size is None or _value_type(size.ret_type).kind not in _INDEX_TYPEKINDS:
+            size = None
+        else:
+            generator = LenGenerator(
+                size.name, size.ret_type, self.typenames, self.includes, class_.name
+            )
+            protocols["__len__"] = BindedFunc(size, generator)
+
+        getitem = member("__getitem__")
+        if (
+            size is not None
+            and getitem is not None
+            and len(getitem.args) == 1
+            and _value_type(getitem.args[0].type).kind in _INDEX_TYPEKINDS
+        ):
+            ele_type = _value_type(getitem.ret_type)
+            data = accessor("data")
+            if data is not None:
+                data_type = _value_type(data.ret_type)
+                if (
+                    ele_type.kind not in NUMERIC_TYPEKINDS
+                    or ele_type.kind == TypeKind.BOOL
+                    or data_type.kind != TypeKind.POINTER
+                    or data_type.pointee.get_canonical().kind != ele_type.kind
+                ):
+                    data = None
+            try:
+                generator = SequenceGetItemGenerator(
+                    getitem.ret_type,
+                    self.typenames,
+                    self.includes,
+                    class_.name,
+                    size.name,
+                    None if data is None else data.name,
+                )
+            except NotImplementedError:
+                ...  # bound as a plain method
+            else:
+                protocols["__getitem__"] = BindedFunc(getitem, generator)
+
+        begin, end = accessor("begin"), accessor("end")
+        if begin is None or end is None:
+            return protocols
+        begin_type, end_type = _value_type(begin.ret_type), _value_type(end.ret_type)
+        if begin_type.kind != TypeKind.POINTER or begin_type.name != end_type.name:
+            return protocols
+        try:
+            generator = IterGenerator(
+                begin.name,
+                end.name,
+                begin.ret_type,
+                self.typenames,
+                self.includes,
+                class_.name,
+            )
+        except NotImplementedError:
+            # indexing still makes the class iterable
+            return protocols
+        # the pointers themselves are meaningless in Python
+        protocols["begin"] = BindedFunc(begin, generator)
+        protocols["end"] = None
+        return protocols
@@ -1,8 +1,19 @@
 from .cxxtypes import CXXType, TypeNames
 from .type_conversion import (
+    BATCH_INDEX,
+    NUMERIC_TYPEKINDS,
     AbstractTypeConverter,
     BaseTypeConverter,
+    MapViewConverter,
+    NumericVectorListConverter,
+    STLConverter,
     VoidPtrConverter,
+    create_array_view_converter,
+    create_batch_converter,
+    create_bytes_converter,
+    create_output_converter,
     create_type_converter,
+    dtype_format,
     init_converters,
+    npy_typenum,
 )
@@ -70,8 +70,8 @@ class CXXType:
             plain_name = (
                 name.replace("const ", "")
                 .replace("*const", "*")
-                .replace(" &", "")
                 .replace(" &&", "")
+                .replace(" &", "")
             )
             ret = cls(
                 type=type,
@@ -96,8 +96,41 @@ class TypeNames:
     enums: set[str]
 
     derives: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    # base extension type each wrapper inherits from
+    parents: dict[str, str] = field(default_factory=dict)
+    # plain data classes with a NumPy structured dtype
+    records: set[str] = field(default_factory=set)
+
+    def is_subclass(self, class_name: str, base_name: str) -> bool:
+        """Whether the wrapper of class_name inherits from that of base_name."""
+        while class_name in self.parents:
+            class_name = self.parents[class_name]
+            if class_name == base_name:
+                return True
+        return False
+
+    def get_fused_derives(self, class_name: str) -> set[str]:
+        """Derived classes that can not be passed as the wrapper of class_name,
+        nor as the wrapper of another derived class."""
+        derives = self.derives.get(class_name, set())
+        candidates = derives | {class_name}
+        return {
+            derived
+            for derived in derives
+            if not any(self.is_subclass(derived, base) for base in candidates)
+        }
 
     def get_fused_name(self, class_name: str) -> str:
-        if class_name in self.derives:
+        if self.get_fused_derives(class_name):
             return f"_Derived{class_name}"
         return class_name
+
+    def is_final(self, class_name: str) -> bool:
+        """No wrapper inherits from that of class_name."""
+        return class_name not in self.parents.values()
+
+    def get_root(self, class_name: str) -> str:
+        """The class whose pointer type `thisptr` is declared with."""
+        while class_name in self.parents:
+            class_name = self.parents[class_name]
+        return class_name
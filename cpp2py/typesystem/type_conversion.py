@@ -1,11 +1,11 @@
 import re
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import List, Optional, Set, Tuple
 
 from clang.cindex import TypeKind
 
 from ..config import Imports
-from ..utils import render
+from ..utils import removeprefix, render
 from .cxxtypes import CXXType, TypeNames
 
 
@@ -61,16 +61,48 @@ class AbstractTypeConverter(metaclass=ABCMeta):
     def return_output(self, cpp_call: str, **kwargs) -> str:
         """return output"""
 
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        """Statements converting the result of `cpp_call`, and the expression
+        of the Python result (None if there is none), for other values to be
+        returned along with it. By default the one of a `return` statement."""
+        output = self.return_output(cpp_call, **kwargs)
+        if "\n" in output or not output.startswith("return "):
+            raise NotImplementedError(
+                "Unsupported: output arguments of this return type"
+            )
+        return "", removeprefix(output, "return ")
+
+    def after_call(self) -> str:
+        """Statements run after the C++ call returned, before returning."""
+        return ""
+
     def pysign_type_decl(self, is_parameter: bool):
         """used in stub files"""
         return "Any"
 
 
+def _return_statements(statements: str, result: Optional[str]) -> str:
+    """`return_output` of the statements and result of `return_result`"""
+    if result is None:
+        return statements
+    return "\n".join(filter(None, [statements, f"return {result}"]))
+
+
+_REF_TYPEKINDS = {TypeKind.LVALUEREFERENCE, TypeKind.RVALUEREFERENCE}
+
+
 class BaseTypeConverter(AbstractTypeConverter):
     def __init__(
         self, type: CXXType, argname: str, typenames: TypeNames, includes: Imports
     ):
-        if type.kind in {TypeKind.LVALUEREFERENCE, TypeKind.RVALUEREFERENCE}:
+        if (
+            type.kind not in _REF_TYPEKINDS
+            and type.get_canonical().kind in _REF_TYPEKINDS
+        ):
+            # reference hidden behind a typedef
+            type = type.get_canonical()
+        self.is_reference = type.kind in _REF_TYPEKINDS
+        if self.is_reference:
             type = type.pointee
         super().__init__(type, argname, typenames, includes)
 
@@ -106,6 +138,9 @@ class VoidConverter(BaseTypeConverter):
     def return_output(self, cpp_call: str, **kwargs) -> str:
         return cpp_call
 
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return cpp_call, None
+
     def pysign_type_decl(self, is_parameter: bool):
         if not is_parameter:
             return "None"
@@ -131,6 +166,50 @@ NUMERIC_TYPEKINDS = {
 }
 
 
+def npy_typenum(kind: TypeKind) -> str:
+    """NumPy type number of a numeric type, e.g. np.NPY_FLOAT64"""
+    return f"np.NPY_{NUMERIC_TYPEKINDS[kind].split('.')[-1].upper()}"
+
+
+def dtype_format(type: CXXType, records: Set[str]) -> Optional[str]:
+    """NumPy dtype format of a field of a record, None if unsupported"""
+    type = type.get_canonical()
+    shape = []
+    while type.kind == TypeKind.CONSTANTARRAY:
+        shape.append(type.type.element_count)
+        type = type.ele_type.get_canonical()
+    if type.kind == TypeKind.BOOL:
+        format = "np.bool_"  # `bool` is cimported from libcpp
+    elif type.kind in NUMERIC_TYPEKINDS:
+        format = NUMERIC_TYPEKINDS[type.kind]
+    elif type.kind == TypeKind.RECORD and type.plain_name in records:
+        format = f"_{type.plain_name}_dtype()"
+    else:
+        return None
+    if shape:
+        return f"({format}, {tuple(shape)})"
+    return format
+
+
+# Cython names of numeric types, for `VoidPtrConverter.real_type`
+_NUMERIC_TYPENAMES = {
+    "bool": TypeKind.BOOL,
+    "unsigned char": TypeKind.UCHAR,
+    "unsigned short": TypeKind.USHORT,
+    "unsigned int": TypeKind.UINT,
+    "unsigned long": TypeKind.ULONG,
+    "unsigned long long": TypeKind.ULONGLONG,
+    "char": TypeKind.CHAR_S,
+    "short": TypeKind.SHORT,
+    "int": TypeKind.INT,
+    "long": TypeKind.LONG,
+    "long long": TypeKind.LONGLONG,
+    "float": TypeKind.FLOAT,
+    "double": TypeKind.DOUBLE,
+    "long double": TypeKind.LONGDOUBLE,
+}
+
+
 class NumericConverter(BaseTypeConverter):
     def _matches(self):
         return self.cxxtype.kind in NUMERIC_TYPEKINDS
@@ -158,7 +237,141 @@ class StringConverter(CStringConverter):
         return self.cxxtype.plain_name == "basic_string[char]"
 
 
+# conversions between the C++ strings and bytes/buffers, without codecs
+_STRING_HELPERS = {
+    "_cstring_to_bytes": """cdef inline object _cstring_to_bytes(const char * s):
+    return None if s == NULL else PyBytes_FromString(<char *> s)""",
+    "_string_to_bytes": """cdef inline bytes _string_to_bytes(const string & s):
+    return PyBytes_FromStringAndSize(<char *> s.data(), s.size())""",
+    "_buffer_to_string": """cdef inline string _buffer_to_string(const unsigned char[::1] data):
+    if data.shape[0] == 0:
+        return string()
+    return string(<const char *> &data[0], data.shape[0])""",
+    "_buffer_to_string_view": """cdef inline cpp.string_view _buffer_to_string_view(const unsigned char[::1] data):
+    # views the buffer, which must outlive the string_view
+    if data.shape[0] == 0:
+        return cpp.string_view()
+    return cpp.string_view(<const char *> &data[0], data.shape[0])""",
+    "_string_view_to_bytes": """cdef inline bytes _string_view_to_bytes(cpp.string_view s):
+    return PyBytes_FromStringAndSize(<char *> s.data(), s.size())""",
+    "_string_view_to_str": """cdef inline str _string_view_to_str(cpp.string_view s):
+    return PyUnicode_DecodeUTF8(<char *> s.data(), s.size(), NULL)""",
+}
+
+
+def _add_string_helpers(includes: Imports, *names: str):
+    for name in names:
+        includes.add_helper(name, _STRING_HELPERS[name])
+
+
+class StringViewConverter(BaseTypeConverter):
+    """`std::string_view` views the UTF-8 encoding of a str argument, and is
+    decoded when returned"""
+
+    def _matches(self) -> bool:
+        return self.cxxtype.plain_name == "basic_string_view[char]"
+
+    def _add_includes(self, includes):
+        includes.mods["pyunicode"] = True
+        _add_string_helpers(includes, "_buffer_to_string_view", "_string_view_to_str")
+
+    def input_type_decl(self):
+        return "str"
+
+    def python_to_cpp(self):
+        return (
+            f"cdef bytes {self.py_argname}_encoded = {self.py_argname}.encode()\n"
+            f"cdef cpp.string_view {self.cpp_argname} = "
+            f"_buffer_to_string_view({self.py_argname}_encoded)"
+        )
+
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return f"return _string_view_to_str({cpp_call})"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return "str"
+
+
+class BytesCStringConverter(CStringConverter):
+    """Config.bytes_strings, `const char*` borrows the buffer of a bytes
+    argument (`char*` the one of a bytearray), and is returned as bytes"""
+
+    def _add_includes(self, includes):
+        includes.mods["pybytes"] = True
+        _add_string_helpers(includes, "_cstring_to_bytes")
+
+    def input_type_decl(self):
+        if self.cxxtype.pointee.type.is_const_qualified():
+            return "bytes"
+        return "bytearray"
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return f"return _cstring_to_bytes({cpp_call})"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return self.input_type_decl() if is_parameter else "bytes | None"
+
+
+_BUFFER_DECL = "const unsigned char[::1]"
+_BUFFER_PYSIGN = "bytes | bytearray | memoryview"
+
+
+class BytesStringConverter(StringConverter):
+    """Config.bytes_strings, `std::string` is copied from any contiguous
+    buffer, and is returned as bytes"""
+
+    def _add_includes(self, includes):
+        includes.mods["pybytes"] = True
+        _add_string_helpers(includes, "_buffer_to_string", "_string_to_bytes")
+
+    def input_type_decl(self):
+        return _BUFFER_DECL
+
+    def python_to_cpp(self):
+        return f"cdef string {self.cpp_argname} = _buffer_to_string({self.py_argname})"
+
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return f"return _string_to_bytes({cpp_call})"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return _BUFFER_PYSIGN if is_parameter else "bytes"
+
+
+class BytesStringViewConverter(StringViewConverter):
+    """Config.bytes_strings, `std::string_view` views any contiguous buffer
+    without copy, and is returned as bytes"""
+
+    def _add_includes(self, includes):
+        includes.mods["pybytes"] = True
+        _add_string_helpers(includes, "_buffer_to_string_view", "_string_view_to_bytes")
+
+    def input_type_decl(self):
+        return _BUFFER_DECL
+
+    def python_to_cpp(self):
+        return (
+            f"cdef cpp.string_view {self.cpp_argname} = "
+            f"_buffer_to_string_view({self.py_argname})"
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return f"return _string_view_to_bytes({cpp_call})"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return _BUFFER_PYSIGN if is_parameter else "bytes"
+
+
 class CStringArrayConverter(BaseTypeConverter):
+    """`char**` is a NULL terminated table of copies of the encoded strings,
+    allocated on the stack for at most 64 strings. `const char**` points to
+    `bytes` as is."""
+
     def _matches(self) -> bool:
         return (
             self.cxxtype.kind == TypeKind.POINTER
@@ -167,14 +380,17 @@ class CStringArrayConverter(BaseTypeConverter):
         )
 
     def _add_includes(self, includes):
-        includes.mods["malloc"] = True
+        includes.stl["vector"] = True
 
     def python_to_cpp(self):
-        return f"""cdef char** {self.cpp_argname} = <char **>malloc(sizeof(char *)*len({self.py_argname}))
-cdef unsigned int {self.py_argname}_idx
-for {self.py_argname}_idx in range(len({self.py_argname})):
-    {self.cpp_argname}[{self.py_argname}_idx] = {self.py_argname}[{self.py_argname}_idx]
-"""
+        is_const = self.cxxtype.pointee.pointee.type.is_const_qualified()
+        return render(
+            "convert_cstring_array",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            char_type="const char" if is_const else "char",
+            copy=not is_const,
+        )
 
     def input_type_decl(self):
         return "object"
@@ -183,27 +399,97 @@ for {self.py_argname}_idx in range(len({self.py_argname})):
         return self.cpp_argname
 
     def pysign_type_decl(self, is_parameter: bool):
-        return "Iterable[str]"
+        return "Iterable[str | bytes]"
 
     def return_output(self, cpp_call: str, **kwargs) -> str:
         raise NotImplementedError
 
 
-class FixedSizeArrayConverter(BaseTypeConverter):
+class NumericPtrPtrConverter(BaseTypeConverter):
+    """`T**` views the rows of a 2-D C-contiguous ndarray through a table of
+    row pointers, `const T**` also takes a sequence of 1-D arrays."""
+
     def _matches(self):
-        if self.cxxtype.kind == TypeKind.CONSTANTARRAY:
-            self.size = self.cxxtype.type.element_count
-            self.ele_type = self.cxxtype.ele_type
-            return self.ele_type.kind in NUMERIC_TYPEKINDS
+        if (
+            self.cxxtype.kind == TypeKind.POINTER
+            and self.cxxtype.pointee.kind == TypeKind.POINTER
+        ):
+            self.ele_type = self.cxxtype.pointee.pointee.get_canonical()
+            self.is_const = self.ele_type.type.is_const_qualified()
+            return (
+                self.ele_type.kind in NUMERIC_TYPEKINDS
+                and self.ele_type.kind != TypeKind.CHAR_S
+            )
         return False
 
+    def _add_includes(self, includes):
+        includes.stl["vector"] = True
+        if self.is_const:
+            includes.mods["buffer"] = True
+
     def python_to_cpp(self):
+        return render(
+            "convert_numeric_ptr_ptr",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            ele_type=self.ele_type.name,
+            is_const=self.is_const,
+        )
+
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
+    def input_type_decl(self):
+        if self.is_const:
+            return "object"
+        return f"{self.ele_type.name}[:, ::1]"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        array_typing = (
+            f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.ele_type.kind]}]]"
+        )
+        if self.is_const:
+            return f"{array_typing} | Iterable[{array_typing}]"
+        return array_typing
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        raise NotImplementedError
+
+
+class FixedSizeArrayConverter(BaseTypeConverter):
+    """`T x[M][N]` is copied from a contiguous buffer by memcpy (indexing only
+    other sequences), a field of this type is a writable view of the object."""
+
+    def _matches(self):
+        self.shape = []
+        array_type = self.cxxtype
+        while array_type.kind == TypeKind.CONSTANTARRAY:
+            self.shape.append(array_type.type.element_count)
+            array_type = array_type.ele_type.get_canonical()
+        self.ele_type = array_type
+        return bool(self.shape) and self.ele_type.kind in NUMERIC_TYPEKINDS
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+        includes.mods["buffer"] = True
+        includes.mods["memcpy"] = True
+
+    def python_to_cpp(self):
+        indices = [f"{self.py_argname}_i{i}" for i in range(len(self.shape))]
+        # x, x[x_i0], x[x_i0][x_i1], ...
+        items = [
+            self.py_argname + "".join(f"[{idx}]" for idx in indices[:dim])
+            for dim in range(len(self.shape) + 1)
+        ]
         return render(
             "convert_fixed_array",
             py_argname=self.py_argname,
             cpp_argname=self.cpp_argname,
-            size=self.size,
-            ele_type=self.ele_type,
+            shape=self.shape,
+            indices=indices,
+            items=items,
+            ele_type=self.ele_type.name,
+            view_axes=", ".join([":"] * (len(self.shape) - 1) + ["::1"]),
         )
 
     def cpp_call_arg(self):
@@ -212,8 +498,26 @@ class FixedSizeArrayConverter(BaseTypeConverter):
     def input_type_decl(self):
         return "object"
 
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        # only fields have array types, `self` keeps their memory alive
+        return (
+            render(
+                "convert_array_view",
+                shape=self.shape,
+                typenum=npy_typenum(self.ele_type.kind),
+                data=f"&{cpp_call}{'[0]' * len(self.shape)}",
+                nullable=False,
+            ),
+            "arr",
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
+
     def pysign_type_decl(self, is_parameter: bool):
-        return "Iterable"
+        if is_parameter:
+            return "Iterable"
+        return f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.ele_type.kind]}]]"
 
 
 class EnumConverter(BaseTypeConverter):
@@ -242,7 +546,8 @@ class NumericPtrConverter(BaseTypeConverter):
         return f"{self.pointee.name}[:]"
 
     def cpp_call_arg(self):
-        return f"&{self.py_argname}[0]"
+        # no element to take the address of when the size is 0
+        return f"(&{self.py_argname}[0] if {self.py_argname}.shape[0] > 0 else NULL)"
 
     def return_output(self, cpp_call: str, **kwargs) -> str:
         return f"return deref({cpp_call})"
@@ -268,7 +573,7 @@ class VoidPtrConverter(BaseTypeConverter):
         return f"{self.real_type()}[:]"
 
     def cpp_call_arg(self):
-        return f"<void *>&{self.py_argname}[0]"
+        return f"(<void *>&{self.py_argname}[0] if {self.py_argname}.shape[0] > 0 else NULL)"
 
     def return_output(self, cpp_call: str, **kwargs) -> str:
         return f"return deref(<{self.real_type()} *> {cpp_call})"
@@ -287,10 +592,22 @@ class ClassConverter(BaseTypeConverter):
         includes.mods["malloc"] = True
 
     def cpp_call_arg(self):
+        # `T&`/`const T&` bind to the wrapped object itself, no copy is made
         return f"deref(<cpp.{self.cxxtype.plain_name} *> {self.py_argname}.thisptr)"
 
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return (
+            render(
+                "convert_class",
+                name=self.cxxtype.plain_name,
+                root=self.typenames.get_root(self.cxxtype.plain_name),
+                cpp_call=cpp_call,
+            ),
+            "obj",
+        )
+
     def return_output(self, cpp_call: str, **kwargs) -> str:
-        return render("convert_class", name=self.cxxtype.plain_name, cpp_call=cpp_call)
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
 
     def input_type_decl(self):
         return self.cxxtype.plain_name
@@ -310,19 +627,57 @@ class ClassPtrConverter(BaseTypeConverter):
     def cpp_call_arg(self):
         return f"<cpp.{self.pointee.plain_name} *>{self.py_argname}.thisptr"
 
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return (
+            render(
+                "convert_class_ptr",
+                name=self.pointee.plain_name,
+                root=self.typenames.get_root(self.pointee.plain_name),
+                copy=kwargs["copy"],
+                cpp_call=cpp_call,
+            ),
+            "obj",
+        )
+
     def return_output(self, cpp_call: str, **kwargs) -> str:
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
+
+    def input_type_decl(self):
+        return self.pointee.plain_name
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return self.pointee.plain_name
+
+
+class RecordPtrConverter(ClassPtrConverter):
+    """`T*` of a plain data class also takes a structured ndarray of `T.dtype`,
+    whose data is passed without copy"""
+
+    def _matches(self):
+        return super()._matches() and self.pointee.plain_name in self.typenames.records
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+
+    def python_to_cpp(self):
         return render(
-            "convert_class_ptr",
+            "convert_record_ptr",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
             name=self.pointee.plain_name,
-            copy=kwargs["copy"],
-            cpp_call=cpp_call,
+            is_const=self.pointee.type.is_const_qualified(),
         )
 
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
     def input_type_decl(self):
-        return self.pointee.plain_name
+        return "object"
 
     def pysign_type_decl(self, is_parameter: bool):
-        return self.pointee.plain_name
+        if is_parameter:
+            return f"{self.pointee.plain_name} | np.ndarray"
+        return super().pysign_type_decl(is_parameter)
 
 
 class ClassPtrPtrConverter(BaseTypeConverter):
@@ -391,39 +746,322 @@ class STLConverter(BaseTypeConverter):
         return _STL_PYTYPING[self.stl][idx]
 
 
+class NumericVectorConverter(STLConverter):
+    """std::vector of numbers is filled from a contiguous buffer in one bulk
+    copy (iterating only other iterables), and is returned as a ndarray viewing
+    a holder object, the vector is moved into the holder unless it is referenced
+    by C++."""
+
+    def _matches(self):
+        if super()._matches() and self.stl == "vector":
+            self.ele_type = self.cxxtype.template_args[0].get_canonical()
+            # std::vector<bool> has no contiguous storage
+            return (
+                self.ele_type.kind in NUMERIC_TYPEKINDS
+                and self.ele_type.kind != TypeKind.BOOL
+            )
+        return False
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+        includes.mods["move"] = True
+        includes.mods["buffer"] = True
+        self.includes = includes
+
+    def python_to_cpp(self):
+        return render(
+            "convert_buffer_to_vector",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            ele_type=self.ele_type.name,
+        )
+
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
+    def _holder_name(self):
+        return f"_NumericVector_{self.ele_type.name.replace(' ', '_')}"
+
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        holder = self._holder_name()
+        self.includes.add_helper(
+            holder,
+            render(
+                "vector_holder",
+                holder=holder,
+                ele_type=self.ele_type.name,
+                typenum=npy_typenum(self.ele_type.kind),
+            ),
+        )
+        return (
+            render(
+                "convert_numeric_vector",
+                holder=holder,
+                move=kwargs["copy"] and not self.is_reference,
+                cpp_call=cpp_call,
+            ),
+            "vec_holder.to_array()",
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
+
+    def pysign_type_decl(self, is_parameter: bool):
+        if is_parameter:
+            return super().pysign_type_decl(is_parameter)
+        return f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.ele_type.kind]}]]"
+
+
+class NumericVectorListConverter(NumericVectorConverter):
+    """opt-in, std::vector of numbers is returned as a `list` (converted by
+    Cython) instead of a ndarray, and still filled in one bulk copy"""
+
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return "", cpp_call
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return STLConverter.pysign_type_decl(self, is_parameter)
+
+
+def _callback_type(type) -> Optional[str]:
+    """Cython spelling of a numeric/`const char*` type of a callback"""
+    type = type.get_canonical()
+    if type.kind in NUMERIC_TYPEKINDS:
+        return type.spelling
+    pointee = type.get_pointee()
+    if pointee.kind == TypeKind.CHAR_S and pointee.is_const_qualified():
+        return "const char *"
+    return None
+
+
+class FunctionPtrConverter(BaseTypeConverter):
+    """Function pointer taking numbers (or `const char*`) and returning a
+    number or void, a Python callable is called through a trampoline, a
+    PyCapsule of a C function is passed as is"""
+
+    def _matches(self):
+        if (
+            self.cxxtype.kind != TypeKind.POINTER
+            or self.cxxtype.pointee.get_canonical().kind != TypeKind.FUNCTIONPROTO
+        ):
+            return False
+        proto = self.cxxtype.pointee.get_canonical().type
+        if proto.is_function_variadic():
+            return False
+        self.arg_types = [_callback_type(t) for t in proto.argument_types()]
+        result = proto.get_result().get_canonical()
+        self.ret_type = (
+            "void" if result.kind == TypeKind.VOID else _callback_type(result)
+        )
+        if None in self.arg_types or self.ret_type in (None, "const char *"):
+            return False
+        self.arg_kinds = [t.get_canonical().kind for t in proto.argument_types()]
+        self.ret_kind = result.kind
+        return True
+
+    def _add_includes(self, includes):
+        includes.mods["pycapsule"] = True
+        includes.mods["threading"] = True
+        names = [self.ret_type, *self.arg_types]
+        self.callback = "_Callback_" + "_".join(
+            re.sub(r"\W+", "_", name.replace("*", "ptr")).strip("_") for name in names
+        )
+        py_args = [
+            f"(None if arg{idx} == NULL else arg{idx})"
+            if arg_type == "const char *"
+            else f"arg{idx}"  # numbers are converted by Cython
+            for idx, arg_type in enumerate(self.arg_types)
+        ]
+        includes.add_helper("_CallbackScope", render("callback_scope"))
+        includes.add_helper(
+            self.callback,
+            render(
+                "callback",
+                callback=self.callback,
+                ret_type=self.ret_type,
+                arg_types=self.arg_types,
+                py_args=py_args,
+            ),
+        )
+
+    def input_type_decl(self):
+        return "object"
+
+    def python_to_cpp(self):
+        return render(
+            "convert_callback",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            callback=self.callback,
+        )
+
+    def cpp_call_arg(self):
+        return self.cpp_argname
+
+    def after_call(self):
+        return (
+            f"if {self.py_argname}_scope is not None:\n"
+            f"    {self.py_argname}_scope.close()"
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        raise NotImplementedError("Unsupported: function pointer as return value")
+
+    def pysign_type_decl(self, is_parameter: bool):
+        def pysign(kind: TypeKind):
+            return NUMERIC_TYPEKINDS.get(kind, "str | None")
+
+        args = ", ".join(pysign(kind) for kind in self.arg_kinds)
+        ret = "None" if self.ret_type == "void" else pysign(self.ret_kind)
+        return f"Callable[[{args}], {ret}] | None"
+
+
 class ClassVectorConverter(STLConverter):
+    """std::vector of wrapped classes is held by a generated `{T}Vector`
+    extension type, which is passed to C++ as is and returned by C++"""
+
     def _matches(self):
         match = _SUPPORTED_STL_PATTERN.match(self.cxxtype.cppname)
         if match is not None and match.group(1) == "vector":
             subtype = self.cxxtype.template_args[0]
             if subtype.plain_name in self.classnames:
                 self.subtype = subtype
-                self.impl_name = f"vector[cpp.{subtype.plain_name}]"
+                self.vector_name = f"{subtype.plain_name}Vector"
                 return True
         return False
 
     def _add_includes(self, includes):
         includes.mods["deref"] = True
+        includes.mods["move"] = True
+        name = self.subtype.plain_name
+        self.is_record = name in self.typenames.records
+        if self.is_record:
+            includes.mods["numpy"] = True
+        includes.add_helper(
+            self.vector_name,
+            render(
+                "class_vector",
+                vector=self.vector_name,
+                name=name,
+                root=self.typenames.get_root(name),
+                record=self.is_record,
+            ),
+            stub=render(
+                "class_vector_stub",
+                vector=self.vector_name,
+                name=name,
+                record=self.is_record,
+            ),
+        )
 
     def python_to_cpp(self):
         return render(
             "convert_vector",
-            python_argname=self.py_argname,
-            cpp_tname=self.subtype,
-            cpp_type_decl=self.impl_name,
-            cython_argname=self.cpp_argname,
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            name=self.subtype.plain_name,
+            vector=self.vector_name,
+            record=self.is_record,
         )
 
     def pysign_type_decl(self, is_parameter: bool):
         if is_parameter:
-            return f"list[{self.subtype.plain_name}]"
-        raise NotImplementedError()
+            pytype = f"Iterable[{self.subtype.plain_name}] | {self.vector_name}"
+            return f"{pytype} | np.ndarray" if self.is_record else pytype
+        return self.vector_name
 
     def cpp_call_arg(self):
-        return self.cpp_argname
+        return f"deref({self.cpp_argname})"
+
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return (
+            render(
+                "convert_class_vector",
+                vector=self.vector_name,
+                move=kwargs["copy"] and not self.is_reference,
+                cpp_call=cpp_call,
+            ),
+            "vec_obj",
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
+
+
+def _scalar_pysign(type: CXXType) -> str:
+    if type.kind in NUMERIC_TYPEKINDS:
+        return NUMERIC_TYPEKINDS[type.kind]
+    if type.plain_name == "basic_string[char]":
+        return "str"
+    return "Any"
+
+
+class MapViewConverter(STLConverter):
+    """opt-in, std::map/std::unordered_map is returned as a lazy read-only
+    `Mapping` owning the container (or viewing a field of the wrapped object),
+    lookups and iteration run in C++ and only dict() converts eagerly"""
+
+    def _matches(self):
+        if super()._matches() and self.stl in ("map", "unordered_map"):
+            key = self.cxxtype.template_args[0].get_canonical()
+            return key.kind in NUMERIC_TYPEKINDS or _scalar_pysign(key) == "str"
+        return False
+
+    def _add_includes(self, includes):
+        includes.mods["deref"] = True
+        includes.mods["inc"] = True
+        includes.mods["mapping"] = True
+        includes.mods["move"] = True
+        if self.raw_cxxtype.template_args:
+            self.map_name = self.raw_cxxtype.plain_name
+        else:
+            # typedef of the container
+            self.map_name = f"cpp.{self.raw_cxxtype.plain_name}"
+        self.view_name = "_MapView_" + re.sub(r"\W+", "_", self.map_name).strip("_")
+        key, value = (t.get_canonical() for t in self.cxxtype.template_args[:2])
+        self.key_pysign, self.value_pysign = _scalar_pysign(key), _scalar_pysign(value)
+        includes.add_helper(
+            self.view_name,
+            render("map_view", view=self.view_name, map=self.map_name, stl=self.stl),
+            stub=render(
+                "map_view_stub",
+                view=self.view_name,
+                key=self.key_pysign,
+                value=self.value_pysign,
+            ),
+        )
+
+    def python_to_cpp(self):
+        return render(
+            "convert_map_arg",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            map=self.map_name,
+            view=self.view_name,
+        )
+
+    def cpp_call_arg(self):
+        return f"deref({self.cpp_argname})"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        if is_parameter:
+            return f"Mapping[{self.key_pysign}, {self.value_pysign}]"
+        return self.view_name
+
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        return (
+            render(
+                "convert_map_view",
+                view=self.view_name,
+                borrow=not kwargs["copy"],
+                move=not self.is_reference,
+                cpp_call=cpp_call,
+            ),
+            "map_view",
+        )
 
     def return_output(self, cpp_call: str, **kwargs) -> str:
-        raise NotImplementedError()
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
 
 
 DEFAULT_CONVERTERS: List[type] = [
@@ -432,13 +1070,18 @@ DEFAULT_CONVERTERS: List[type] = [
     NumericConverter,
     NumericPtrConverter,
     CStringArrayConverter,
+    NumericPtrPtrConverter,
     FixedSizeArrayConverter,
     EnumConverter,
     ClassConverter,
+    RecordPtrConverter,
     ClassPtrConverter,
     ClassPtrPtrConverter,
+    FunctionPtrConverter,
     StringConverter,
+    StringViewConverter,
     ClassVectorConverter,
+    NumericVectorConverter,
     STLConverter,
 ]
 CONVERTERS = DEFAULT_CONVERTERS
@@ -449,6 +1092,355 @@ def init_converters(custom_converters: List[type]):
     CONVERTERS = custom_converters + DEFAULT_CONVERTERS
 
 
+class OutputScalarConverter(BaseTypeConverter):
+    """`T&`/`T*` output argument of a number, returned after the call"""
+
+    is_parameter = False
+
+    def _matches(self):
+        if self.is_reference:
+            self.value_type = self.cxxtype
+        elif self.cxxtype.kind == TypeKind.POINTER:
+            self.value_type = self.cxxtype.pointee.get_canonical()
+        else:
+            return False
+        return self.value_type.kind in NUMERIC_TYPEKINDS
+
+    def python_to_cpp(self):
+        return f"cdef {self.value_type.name.replace('const ', '')} {self.cpp_argname}"
+
+    def cpp_call_arg(self):
+        if self.is_reference:
+            return self.cpp_argname
+        return f"&{self.cpp_argname}"
+
+    def input_type_decl(self):
+        raise NotImplementedError("Unsupported: output argument as parameter")
+
+    def output_value(self):
+        return self.cpp_argname
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return NUMERIC_TYPEKINDS[self.value_type.kind]
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        raise NotImplementedError
+
+
+class OutputArrayConverter(BaseTypeConverter):
+    """`T*` output argument of `size` numbers, an optional contiguous buffer
+    which is allocated when it is not given, then returned after the call"""
+
+    is_parameter = True
+
+    def __init__(
+        self,
+        type: CXXType,
+        argname: str,
+        size: str,
+        typenames: TypeNames,
+        includes: Imports,
+    ):
+        self.size = size
+        super().__init__(type, argname, typenames, includes)
+
+    def _matches(self):
+        if self.cxxtype.kind == TypeKind.POINTER:
+            self.pointee = self.cxxtype.pointee.get_canonical()
+            return self.pointee.kind in NUMERIC_TYPEKINDS
+        return False
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+
+    def python_to_cpp(self):
+        return f"""if {self.py_argname} is None:
+    {self.py_argname} = np.empty({self.size}, dtype={NUMERIC_TYPEKINDS[self.pointee.kind]})
+elif {self.py_argname}.shape[0] < {self.size}:
+    raise ValueError(f"Expected buffer of at least {{ {self.size} }} elements, got {{ {self.py_argname}.shape[0] }}")"""
+
+    def cpp_call_arg(self):
+        # no element to take the address of when the size is 0
+        return f"(&{self.py_argname}[0] if {self.py_argname}.shape[0] > 0 else NULL)"
+
+    def input_type_decl(self):
+        return f"{self.pointee.name}[::1]"
+
+    def output_value(self):
+        # the caller's buffer, or the allocated ndarray
+        return f"{self.py_argname}.base"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        array_typing = (
+            f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.pointee.kind]}]]"
+        )
+        if is_parameter:
+            return f"{array_typing} | None"
+        return array_typing
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        raise NotImplementedError
+
+
+class ArrayViewConverter(BaseTypeConverter):
+    """`T*` field pointing to `size` numbers, read as a ndarray viewing them;
+    `void*` fields take the element type of their registered converter"""
+
+    def __init__(
+        self,
+        type: CXXType,
+        argname: str,
+        size: str,
+        typenames: TypeNames,
+        includes: Imports,
+    ):
+        self.size = size
+        self.includes = includes
+        super().__init__(type, argname, typenames, includes)
+
+    def _matches(self):
+        if self.cxxtype.kind != TypeKind.POINTER:
+            return False
+        pointee = self.cxxtype.pointee.get_canonical()
+        if pointee.kind == TypeKind.VOID:
+            converter = create_type_converter(
+                self.raw_cxxtype, self.py_argname, self.typenames, self.includes
+            )
+            if not isinstance(converter, VoidPtrConverter):
+                return False
+            self.ele_kind = _NUMERIC_TYPENAMES.get(converter.real_type())
+        else:
+            self.ele_kind = pointee.kind
+        return self.ele_kind in NUMERIC_TYPEKINDS
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+
+    def return_result(self, cpp_call: str, **kwargs) -> Tuple[str, Optional[str]]:
+        # only fields are viewed, `self` keeps their memory alive
+        return (
+            render(
+                "convert_array_view",
+                shape=[self.size],
+                typenum=npy_typenum(self.ele_kind),
+                data=f"<void *>{cpp_call}",
+                nullable=True,
+            ),
+            "arr",
+        )
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        return _return_statements(*self.return_result(cpp_call, **kwargs))
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.ele_kind]}]] | None"
+
+
+def create_array_view_converter(
+    type: CXXType,
+    argname: str,
+    size: str,
+    typenames: TypeNames,
+    includes: Imports,
+) -> AbstractTypeConverter:
+    converter = ArrayViewConverter(type, argname, size, typenames, includes)
+    if converter.match:
+        return converter
+    raise NotImplementedError(f'No array view available for type "{type}"')
+
+
+def create_output_converter(
+    type: CXXType,
+    argname: str,
+    size: Optional[str],
+    typenames: TypeNames,
+    includes: Imports,
+) -> AbstractTypeConverter:
+    if size is None:
+        converter = OutputScalarConverter(type, argname, typenames, includes)
+    else:
+        converter = OutputArrayConverter(type, argname, size, typenames, includes)
+    if converter.match:
+        return converter
+    raise NotImplementedError(f'No output conversion available for type "{type}"')
+
+
+# loop variable of the batched calls, indexing the arrays of arguments
+BATCH_INDEX = "_c_i"
+
+
+class BatchConverter(BaseTypeConverter):
+    """argument of a batched call, an array of arguments whose element
+    `BATCH_INDEX` is passed to the C++ call"""
+
+    def _is_const(self, type: CXXType) -> bool:
+        return type.type.is_const_qualified()
+
+    @abstractmethod
+    def size(self) -> str:
+        """Number of arguments in the array"""
+
+    def return_output(self, cpp_call: str, **kwargs) -> str:
+        raise NotImplementedError
+
+
+class BatchNumericConverter(BatchConverter):
+    """`T`/`T&` number, a contiguous array, written to by non const references"""
+
+    def _matches(self):
+        if self.is_reference and not self._is_const(self.cxxtype):
+            self.decl = f"{self.cxxtype.plain_name}[::1]"
+        else:
+            self.decl = f"const {self.cxxtype.plain_name}[::1]"
+        return (
+            self.cxxtype.kind in NUMERIC_TYPEKINDS
+            and self.cxxtype.kind != TypeKind.BOOL
+        )
+
+    def input_type_decl(self):
+        return self.decl
+
+    def cpp_call_arg(self):
+        return f"{self.py_argname}[{BATCH_INDEX}]"
+
+    def size(self):
+        return f"{self.py_argname}.shape[0]"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return f"np.ndarray[Any, np.dtype[{NUMERIC_TYPEKINDS[self.cxxtype.kind]}]]"
+
+
+class BatchNumericPtrConverter(BatchNumericConverter):
+    """`T*` of numbers, a contiguous 2d array whose rows are pointed to"""
+
+    def _matches(self):
+        if self.cxxtype.kind != TypeKind.POINTER:
+            return False
+        self.cxxtype = self.cxxtype.pointee.get_canonical()
+        const = "const " if self._is_const(self.cxxtype) else ""
+        self.decl = f"{const}{self.cxxtype.plain_name}[:, ::1]"
+        return (
+            self.cxxtype.kind in NUMERIC_TYPEKINDS
+            and self.cxxtype.kind != TypeKind.BOOL
+        )
+
+    def python_to_cpp(self):
+        return f"""if {self.py_argname}.shape[1] == 0:
+    raise ValueError("Expected non empty rows in '{self.py_argname}'")"""
+
+    def cpp_call_arg(self):
+        return f"&{self.py_argname}[{BATCH_INDEX}, 0]"
+
+
+class BatchRecordConverter(BatchConverter):
+    """`T`/`T&`/`T*` of a plain data class, a structured ndarray of `T.dtype`
+    whose data is passed without copy"""
+
+    def _matches(self):
+        self.is_pointer = self.cxxtype.kind == TypeKind.POINTER
+        self.record = self.cxxtype.pointee if self.is_pointer else self.cxxtype
+        return self.record.plain_name in self.typenames.records
+
+    def _add_includes(self, includes):
+        includes.mods["numpy"] = True
+
+    def python_to_cpp(self):
+        return render(
+            "convert_record_array",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            name=self.record.plain_name,
+            is_const=not (self.is_pointer or self.is_reference)
+            or self._is_const(self.record),
+        )
+
+    def input_type_decl(self):
+        return "np.ndarray"
+
+    def cpp_call_arg(self):
+        if self.is_pointer:
+            return f"{self.cpp_argname} + {BATCH_INDEX}"
+        return f"{self.cpp_argname}[{BATCH_INDEX}]"
+
+    def size(self):
+        return f"{self.py_argname}.size"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return "np.ndarray"
+
+
+class BatchClassConverter(BatchConverter):
+    """`T`/`T&`/`T*` of a wrapped class, a sequence of wrappers"""
+
+    def _matches(self):
+        self.is_pointer = self.cxxtype.kind == TypeKind.POINTER
+        self.class_ = self.cxxtype.pointee if self.is_pointer else self.cxxtype
+        return self.class_.plain_name in self.classnames
+
+    def _add_includes(self, includes):
+        includes.mods["deref"] = True
+        includes.stl["vector"] = True
+
+    def python_to_cpp(self):
+        return render(
+            "convert_class_array",
+            py_argname=self.py_argname,
+            cpp_argname=self.cpp_argname,
+            name=self.class_.plain_name,
+        )
+
+    def input_type_decl(self):
+        return "object"
+
+    def cpp_call_arg(self):
+        if self.is_pointer:
+            return f"{self.cpp_argname}[{BATCH_INDEX}]"
+        return f"deref({self.cpp_argname}[{BATCH_INDEX}])"
+
+    def size(self):
+        return f"{self.cpp_argname}.size()"
+
+    def pysign_type_decl(self, is_parameter: bool):
+        return f"Iterable[{self.class_.plain_name}]"
+
+
+BATCH_CONVERTERS: List[type] = [
+    BatchNumericConverter,
+    BatchNumericPtrConverter,
+    BatchRecordConverter,
+    BatchClassConverter,
+]
+
+
+def create_batch_converter(
+    type: CXXType, argname: str, typenames: TypeNames, includes: Imports
+) -> BatchConverter:
+    """converter of the arguments of Config.parallel_functions"""
+    for converter_type in BATCH_CONVERTERS:
+        converter = converter_type(type, argname, typenames, includes)
+        if converter.match:
+            return converter
+    raise NotImplementedError(f'No batch conversion available for type "{type}"')
+
+
+BYTES_CONVERTERS: List[type] = [
+    BytesCStringConverter,
+    BytesStringConverter,
+    BytesStringViewConverter,
+]
+
+
+def create_bytes_converter(
+    type: CXXType, argname: str, typenames: TypeNames, includes: Imports
+) -> AbstractTypeConverter:
+    """converter of Config.bytes_strings, strings are bytes"""
+    for converter_type in BYTES_CONVERTERS:
+        converter = converter_type(type, argname, typenames, includes)
+        if converter.match:
+            return converter
+    return create_type_converter(type, argname, typenames, includes)
+
+
 def create_type_converter(
     type: CXXType, argname: str, typenames: TypeNames, includes: Imports
 ) -> AbstractTypeConverter:
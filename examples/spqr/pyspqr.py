@@ -1,4 +1,5 @@
 import atexit
+
 import numpy as np
 from scipy import sparse
 
@@ -31,6 +32,38 @@ def scipy_to_cholmod_sparse(mat: sparse.csc_matrix, view: cholmod_sparse):
     return mat, i, p, x
 
 
+class _CholmodSparseDestructor:
+    """Frees a matrix of cholmod, shared by the arrays viewing it"""
+
+    def __init__(self, m: cholmod_sparse, cc):
+        self.m = m
+        self.cc = cc
+
+    def __del__(self):
+        spqr.cholmod_l_free_sparse(self.m, self.cc)
+
+
+class _ArrayView:
+    """Exports the data of `array` with `base` as the owner"""
+
+    def __init__(self, array: np.ndarray, base: _CholmodSparseDestructor):
+        self.__array_interface__ = array.__array_interface__
+        self.base = base
+
+
+def cholmod_to_scipy_sparse(m: cholmod_sparse, cc):
+    """The matrix views the arrays of `m`, which cholmod frees once all of
+    them are collected"""
+    m.owner = False
+    base = _CholmodSparseDestructor(m, cc)
+    data, indices, indptr = (
+        np.asarray(_ArrayView(array, base)) for array in (m.x, m.i, m.p)
+    )
+    return sparse.csc_matrix(
+        (data, indices, indptr), shape=(m.nrow, m.ncol), copy=False
+    )
+
+
 def qr(mat: sparse.csc_matrix):
     cc = spqr.cholmod_common_struct()
     spqr.cholmod_l_start(cc)
@@ -41,11 +74,11 @@ def qr(mat: sparse.csc_matrix):
     Q = cholmod_sparse.__new__(cholmod_sparse)
     R = cholmod_sparse.__new__(cholmod_sparse)
 
-    E, rank = spqr.suite_sparse_qr_c_qr(
+    E, rank = spqr.spqr_qr(
         cvar.SPQR_ORDERING_DEFAULT, cvar.SPQR_DEFAULT_TOL, mat.shape[0], A, Q, R, cc
     )
-    Q = spqr.cholmod_to_scipy_sparse(Q, cc)
-    R = spqr.cholmod_to_scipy_sparse(R, cc)
+    Q = cholmod_to_scipy_sparse(Q, cc)
+    R = cholmod_to_scipy_sparse(R, cc)
 
     atexit.register(lambda: spqr.cholmod_l_finish(cc))
     return Q, R, E, rank
@@ -3,24 +3,6 @@ import pytest
 from tools import cpp2py_tester
 
 
-@cpp2py_tester("overload.hpp", warnmsg="Ignoring overloaded .*")
-def test_overloading_is_not_possible():
-    from overload import A, plus_one
-
-    a = A()
-    assert a.plus_one(3.0) == 4.0
-    assert plus_one(3.0) == 4.0
-
-
-@cpp2py_tester("twoctors.hpp", warnmsg="Ignoring overloaded .*")
-def test_twoctors():
-    from twoctors import A
-
-    A()
-    with pytest.raises(TypeError):
-        A(2)
-
-
 @cpp2py_tester("nodefaultctor.hpp")
 def test_no_default_constructor():
     from nodefaultctor import A
@@ -1,8 +1,10 @@
+import math
+
 import numpy as np
 import pytest
 from cpp2py import Config, VoidPtrConverter
 
-from tools import cpp2py_tester
+from tools import build_cython_module, cpp2py_tester, remove_files
 
 
 @cpp2py_tester(["deppart1.hpp", "deppart2.hpp"], modulename="depcombined")
@@ -59,7 +61,7 @@ def test_struct():
     a.a = 5
     a.b = [1.0, 2.0]
     assert a.a == 5
-    assert a.b == [1.0, 2.0]
+    assert a.b.tolist() == [1.0, 2.0]
     assert print_mystruct_a(a) == "a = 5, b[0] = 1, b[1] = 2, "
     b = B()
     b.a = 10
@@ -101,6 +103,326 @@ def test_operators():
     assert op.v == 0b10
 
 
+@cpp2py_tester("container.hpp")
+def test_container_protocols():
+    from container import Polyline, Samples, Words
+
+    samples = Samples(5)
+    assert len(samples) == 5
+    assert samples[1] == 0.5 and samples[-1] == 2.0
+    with pytest.raises(IndexError):
+        samples[5]
+    view = samples[1:4]  # views the data
+    assert view.tolist() == [0.5, 1.0, 1.5]
+    view[0] = 10.0
+    assert samples[1] == 10.0
+    assert list(samples) == [0.0, 10.0, 1.0, 1.5, 2.0]
+    assert not hasattr(samples, "begin")
+
+    words = Words()
+    words.words = ["a", "b", "c"]
+    assert list(words) == ["a", "b", "c"]
+    assert words[::2] == ["a", "c"]
+    assert "b" in words
+
+    polyline = Polyline()
+    polyline.append(1, 2)
+    polyline.append(3, 4)
+    points = iter(polyline)
+    del polyline
+    assert [(p.x, p.y) for p in points] == [(1, 2), (3, 4)]
+
+
+@cpp2py_tester("functionptr.hpp")
+def test_function_pointers():
+    import ctypes
+
+    import sys
+    import threading
+
+    from functionptr import apply, apply_stored, greet, reduce, store_op
+
+    assert apply(lambda a, b: a - b, 5, 3) == 2
+    # nested calls use their own callable
+    assert apply(lambda a, b: apply(lambda x, y: x * y, a, b) + 1, 2, 3) == 7
+    assert reduce(np.arange(1.0, 5.0), 4, 1.0, lambda acc, x: acc * x) == 24.0
+    messages = []
+    greet("world", messages.append)
+    assert messages == ["world", None]
+    with pytest.raises(ZeroDivisionError):
+        apply(lambda a, b: a // b, 1, 0)
+    with pytest.raises(TypeError):
+        apply(1, 2, 3)
+
+    # a C function is called without going through Python
+    binop = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_int)(max)
+    capsule_new = ctypes.pythonapi.PyCapsule_New
+    capsule_new.restype = ctypes.py_object
+    capsule_new.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
+    capsule = capsule_new(ctypes.cast(binop, ctypes.c_void_p), None, None)
+    assert apply(capsule, 4, 9) == 9
+
+    # a callable kept by C++ has no target after the call, nor on other threads
+    unraisable = []
+    hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+    try:
+        store_op(lambda a, b: a + b)
+        assert apply_stored(1, 2) == 0
+        results = []
+        thread = threading.Thread(target=lambda: results.append(apply_stored(1, 2)))
+        thread.start()
+        thread.join()
+        assert results == [0]
+    finally:
+        sys.unraisablehook = hook
+    assert [type(u.exc_value) for u in unraisable] == [RuntimeError] * 2
+    assert "calling thread" in str(unraisable[0].exc_value)
+
+
+@cpp2py_tester(
+    "asynccalls.hpp",
+    warnmsg="releasing the GIL",
+    config=Config(
+        async_functions=[
+            "waitForFlag",
+            "sumSquares",
+            "echoLength",
+            "Worker::scale",
+            "Worker::shifted",
+            "Worker::fail",
+            "Worker::twice",
+        ]
+    ),
+)
+def test_async_functions():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    import asynccalls
+    from asynccalls import Worker, sum_squares_async, wait_for_flag_async
+
+    # str arguments are converted with the GIL held
+    assert not hasattr(asynccalls, "echo_length_async")
+
+    async def main():
+        flag = np.zeros(1, np.int32)
+        waiting = asyncio.ensure_future(wait_for_flag_async(flag, 5000))
+        # the loop keeps running while the C++ call waits
+        await asyncio.sleep(0.05)
+        flag[0] = 1
+        assert await waiting == 1
+        assert await sum_squares_async(np.arange(4.0), 4) == 14.0
+
+        worker = Worker()
+        worker.base = 3
+        assert await worker.scale_async(2) == 6
+        assert (await worker.shifted_async(4)).base == 7
+        assert await Worker.twice_async(5) == 10
+        with pytest.raises(RuntimeError, match="failed"):
+            await worker.fail_async()
+
+        with ThreadPoolExecutor(1) as executor:
+            flag[0] = 0
+            waiting = asyncio.ensure_future(
+                wait_for_flag_async(flag, 5000, executor=executor)
+            )
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            # the started call still owns the buffer
+            flag[0] = 1
+
+    asyncio.run(main())
+
+
+@cpp2py_tester("pickling.hpp")
+def test_pickling():
+    import pickle
+
+    from pickling import Champion, Cursor, Grid, Session
+
+    grid = Grid()
+    grid.rows = 16
+    grid.cells[:] = np.arange(256)
+    buffers = []
+    data = pickle.dumps(grid, protocol=5, buffer_callback=buffers.append)
+    # the bytes of the object are sent out-of-band
+    assert len(buffers) == 1 and len(data) < 256
+    copy = pickle.loads(data, buffers=buffers)
+    assert copy.rows == 16 and np.array_equal(copy.cells, grid.cells)
+    assert pickle.loads(pickle.dumps(grid, protocol=2)).rows == 16
+
+    champion = Champion()
+    champion.name = "ada"
+    champion.moves = [3, 4]
+    champion.weights = [0.5, 1.0, 1.5, 2.0]
+    champion.board = grid
+    champion.titles = 2
+    for protocol in (2, 5):
+        copy = pickle.loads(pickle.dumps(champion, protocol=protocol))
+        assert isinstance(copy, Champion)
+        assert copy.name == "ada" and list(copy.moves) == [3, 4]
+        assert list(copy.weights) == [0.5, 1.0, 1.5, 2.0]
+        assert copy.board.rows == 16 and copy.titles == 2
+
+    for obj in (Session(), Cursor()):
+        with pytest.raises(TypeError):
+            pickle.dumps(obj)
+
+
+@cpp2py_tester(
+    "batching.hpp",
+    warnmsg="batching",
+    config=Config(
+        batched_members=[
+            "Shape::area",
+            "Square::side",
+            "Square::id",
+            "Square::isUnit",
+            "Square::scaled",
+        ]
+    ),
+)
+def test_batched_members():
+    from batching import Shape, Square, make_squares
+
+    squares = [Square(i, i) for i in range(1000)]
+    areas = Shape.area_batch(squares)
+    assert areas.dtype == np.float64
+    assert np.array_equal(areas, np.arange(1000.0) ** 2)
+    ids = Square.id_batch(squares, num_threads=2)
+    assert ids.dtype == np.int32 and ids[-1] == 999
+
+    # containers of wrappers, written into the given buffer
+    out = np.zeros(5)
+    assert Square.side_batch(make_squares(5), out) is out
+    assert out.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    with pytest.raises(ValueError):
+        Square.side_batch(squares, out)
+    with pytest.raises(TypeError):
+        Shape.area_batch([squares[0], None])
+    assert len(Shape.area_batch([])) == 0
+    # temporary wrappers are held while their C++ objects are read
+    areas = Shape.area_batch(Square(i, i) for i in range(1000))
+    assert np.array_equal(areas, np.arange(1000.0) ** 2)
+
+    # bool results and methods with arguments are not batched
+    assert not hasattr(Square, "is_unit_batch")
+    assert not hasattr(Square, "scaled_batch")
+
+
+@cpp2py_tester(
+    "parallel.hpp",
+    warnmsg="batched variant",
+    config=Config(
+        parallel_functions=[
+            "distance",
+            "dot",
+            "norm",
+            "scale",
+            "weight",
+            "grow",
+            "increment",
+            "isPositive",
+            "label",
+        ]
+    ),
+)
+def test_parallel_functions():
+    import parallel
+    from parallel import Body, Vec3
+
+    x = np.arange(1000.0)
+    res = parallel.distance_batch(x, x)
+    assert res.dtype == np.float64
+    assert np.allclose(res, np.sqrt(2.0) * x)
+    out = np.zeros(1000)
+    assert parallel.distance_batch(x, -x, out, num_threads=2) is out
+    assert np.allclose(out, res)
+    # the OpenMP default number of threads
+    assert np.allclose(parallel.distance_batch(x, x, num_threads=0), res)
+    with pytest.raises(ValueError):
+        parallel.distance_batch(x, x[:10])
+    assert len(parallel.distance_batch(x[:0], x[:0])) == 0
+
+    # rows of pointed numbers
+    a = np.ones((4, 3), dtype=np.float32)
+    b = np.arange(12, dtype=np.float32).reshape(4, 3)
+    assert parallel.dot_batch(a, b).tolist() == [3.0, 12.0, 21.0, 30.0]
+
+    # records, read and modified in place
+    vecs = np.zeros(3, dtype=Vec3.dtype)
+    vecs["x"] = [3.0, 0.0, 1.0]
+    vecs["y"] = [4.0, 0.0, 0.0]
+    assert parallel.norm_batch(vecs).tolist() == [5.0, 0.0, 1.0]
+    parallel.scale_batch(vecs, np.array([2.0, 1.0, 3.0]))
+    assert vecs["x"].tolist() == [6.0, 0.0, 3.0]
+    with pytest.raises(ValueError):
+        parallel.scale_batch(vecs[::2], np.ones(2))
+
+    # sequences of wrapped objects
+    bodies = [Body(i) for i in range(10)]
+    assert parallel.weight_batch(bodies, np.full(10, 2.0))[-1] == 18.0
+    parallel.grow_batch(bodies, np.ones(10))
+    assert bodies[0].mass == 1.0
+    # temporary wrappers are held while their C++ objects are read
+    weights = parallel.weight_batch((Body(i) for i in range(1000)), np.ones(1000))
+    assert np.array_equal(weights, np.arange(1000.0))
+    with pytest.raises(TypeError):
+        parallel.weight_batch([None], np.ones(1))
+
+    # references to numbers are written to
+    values = np.arange(5, dtype=np.int32)
+    parallel.increment_batch(values)
+    assert values.tolist() == [1, 2, 3, 4, 5]
+
+    assert not hasattr(parallel, "is_positive_batch")
+    assert not hasattr(parallel, "label_batch")
+
+
+@cpp2py_tester(
+    "templates.hpp",
+    warnmsg="template not found",
+    config=Config(
+        template_instances=[
+            "minusOne<double>",
+            "minusOne<int>",
+            "sum<double>",
+            "sum<float>",
+            "geometry::Vector<double, 3>",
+            "geometry::dot<double>",
+            "Vector<int, 2>",
+        ]
+    ),
+)
+def test_template_instances():
+    import templates
+    from templates import Vector_double_3
+
+    assert templates.minus_one_double(2.5) == 1.5
+    assert templates.minus_one_int(3) == 2
+    assert templates.minus_one(2.5) == 1.5
+    assert templates.minus_one(3) == 2
+    # integers go to the integer instance, whatever their type
+    assert templates.minus_one(np.int64(3)) == 2
+    assert type(templates.minus_one(True)) is int
+
+    # the dtype picks the instance, the array is passed without copy
+    assert templates.sum(np.arange(4.0), 4) == 6.0
+    assert templates.sum(np.arange(4, dtype=np.float32), 3) == 3.0
+    with pytest.raises(TypeError):
+        templates.sum(np.arange(4), 4)
+
+    v = Vector_double_3(-2.0)
+    assert v.norm1() == 6.0
+    assert list(v.values()) == [-2.0, -2.0, -2.0]
+    assert v.data.tolist() == [-2.0, -2.0, -2.0]
+    assert not hasattr(v, "cast")
+    assert templates.dot_double(np.ones(3), np.arange(3.0), 3) == 3.0
+    assert not hasattr(templates, "Vector_int_2")
+
+
 @cpp2py_tester("typedef.hpp")
 def test_typedef():
     from typedef import fun
@@ -164,7 +486,13 @@ def test_defaultvalues():
 
 @cpp2py_tester("complexhierarchy.hpp")
 def test_complex_hierarchy():
-    from complexhierarchy import A, B
+    from complexhierarchy import A, B, Base1, Base2
+
+    assert issubclass(A, Base2) and issubclass(B, Base2)
+    assert issubclass(Base2, Base1)
+    # only overrides and new members are generated in subclasses
+    assert "base2_method" not in A.__dict__
+    assert "base1_method" in B.__dict__
 
     a = A()
     a.a, a.b, a.c = 1, 2, 3
@@ -179,13 +507,32 @@ def test_complex_hierarchy():
     assert (b.a, b.b, b.d) == (1, 2, 3)
     assert not hasattr(b, "c")
     assert b.base1_method() == 4
+    assert Base1.base1_method(b) == 4
     assert b.base2_method() == 2
     assert b.b_method() == 5
 
 
+@cpp2py_tester("complexhierarchy.hpp", modulename="multipleinheritance")
+def test_multiple_inheritance():
+    from multipleinheritance import A, Both, Left, Right, read_base2, read_right
+
+    a = A()
+    a.b = 7
+    assert read_base2(a) == 7
+    # single inheritance dispatches on the base wrapper, no fused specialisations
+    assert not hasattr(read_base2, "__signatures__")
+
+    both = Both()
+    both.l, both.r, both.both = 1, 2, 3
+    # multiple inheritance falls back to copying base members
+    assert not issubclass(Both, Left)
+    assert (both.l, both.r, both.both) == (1, 2, 3)
+    assert read_right(both) == 2
+
+
 @cpp2py_tester("vinheritance.hpp")
 def test_virtual_inheritance():
-    from vinheritance import B, C, D
+    from vinheritance import B, C, D, read_ma
 
     b = B(1, 2)
     assert (b.m_a, b.m_b) == (1, 2)
@@ -198,6 +545,7 @@ def test_virtual_inheritance():
     d = D(1, 2, 3, 4)
     assert (d.m_a, d.m_d) == (1, 4)
     assert d.get_ma() == d.m_a
+    assert read_ma(d) == 1
 
 
 @cpp2py_tester("throwexception.hpp")
@@ -247,6 +595,92 @@ def test_global_vars_macros():
         cvar.T = True
 
 
+@cpp2py_tester("overload.hpp")
+def test_overloading():
+    from overload import A, B, describe, plus_one, total, type_of
+
+    assert plus_one(3.0) == 4.0
+    assert plus_one(3) == 2
+    assert plus_one(np.float32(3.0)) == 4.0
+    assert plus_one(d=3) == 2
+    # numbers of the kind of a parameter come before conversions
+    assert plus_one(np.int64(3)) == 2 and plus_one(True) == 0
+    assert plus_one(np.float32(3.5)) == 4.5
+    a = A()
+    assert a.plus_one(3.0) == 4.0
+    assert a.plus_one(3) == 2
+    assert a.plus_one(np.int32(3)) == 2
+
+    # resolved by arity, defaults and keywords
+    B()
+    B(2)
+    B(2, 1.0)
+    with pytest.raises(TypeError):
+        B(2, 1.0, 3)
+    assert describe(a) == "A" and describe(B()) == "B"
+    assert describe(1) == "1" and describe(1, 2) == "3" and describe(1, j=3) == "4"
+    with pytest.raises(TypeError):
+        describe(None)
+
+    # resolved by dtype
+    assert total(np.array([2.0, 3.0])) == 5.0
+    assert total(np.array([2, 3], dtype=np.int32)) == 6
+    assert total(np.array([2.0, 4.0])) == 6.0
+    with pytest.raises(TypeError):
+        total(np.array([2, 3], dtype=np.int8))
+
+    # resolutions are cached per argument types, dtypes and keywords
+    for _ in range(2):
+        assert plus_one(np.int64(3)) == 2 and plus_one(np.float32(3.0)) == 4.0
+        assert total(np.array([2, 3], dtype=np.int32)) == 6
+        assert total(np.array([2.0, 3.0], dtype=np.float64)) == 5.0
+        assert describe(1, j=3) == "4" and describe(np.int8(1)) == "1"
+        with pytest.raises(TypeError):
+            describe(1, k=3)
+
+    # only booleans and integers convert to bool
+    assert type_of(True) == "bool" and type_of(2.5) == "double"
+    assert type_of(np.float64(2.5)) == "double"
+    assert type_of(np.bool_(True)) == "bool"
+    with pytest.raises(TypeError):
+        type_of("2.5")
+
+
+@cpp2py_tester("overload.hpp", modulename="overloadapi")
+def test_cimport_overloads():
+    source = """
+cimport overloadapi
+
+def plus_ones(double d, int i):
+    return overloadapi._plus_one_0(d), overloadapi._plus_one_1(i)
+
+def describe_b(int size):
+    cdef overloadapi.B b = overloadapi.B.__new__(overloadapi.B)
+    b._B_init_1(size)
+    return overloadapi._describe_1(b)
+"""
+    targets = build_cython_module("overloaduser", source)
+    try:
+        from overloaduser import describe_b, plus_ones
+
+        assert plus_ones(3.0, 3) == (4.0, 2)
+        assert describe_b(2) == "B"
+    finally:
+        remove_files(targets)
+
+
+@cpp2py_tester("twoctors.hpp")
+def test_two_constructors():
+    from twoctors import A
+
+    assert isinstance(A(), A)
+    assert isinstance(A(2), A) and isinstance(A(a=2), A)
+    with pytest.raises(TypeError):
+        A("2")
+    with pytest.raises(TypeError):
+        A(1, 2)
+
+
 def test_renames_dict():
     config = Config(
         renames_dict={
@@ -272,10 +706,120 @@ def test_renames_dict():
 
 @cpp2py_tester("polymorphism.hpp")
 def test_polymorphism():
-    from polymorphism import get_area, get_perimeter, Circle, Square
+    from polymorphism import get_area, get_perimeter, Circle, Shape, Square
 
     c = Circle(4)
     s = Square(size=3)
 
     assert get_area(c) == c.area()
     assert get_perimeter(s) == s.perimeter()
+    assert not hasattr(get_area, "__signatures__")
+
+    # leaf wrappers are final
+    with pytest.raises(TypeError):
+        type("MyCircle", (Circle,), {})
+    type("MyShape", (Shape,), {})
+    with pytest.raises(TypeError):
+        get_area(object())
+
+
+@cpp2py_tester("polymorphism.hpp", modulename="polymorphismapi")
+def test_cimport_api():
+    source = """
+cimport polymorphismapi
+
+def total_area(list shapes):
+    cdef polymorphismapi.Shape shape
+    cdef double total = 0
+    for shape in shapes:
+        total += polymorphismapi.get_area(shape)
+    return total
+
+def perimeter(polymorphismapi.Square square):
+    return square.thisptr.perimeter()
+
+def diagonal(polymorphismapi.Square square):
+    # cdef fast path of a method of a final wrapper
+    return square._c_diagonal()
+"""
+    targets = build_cython_module("polymorphismuser", source)
+    try:
+        from polymorphismapi import Circle, Square
+        from polymorphismuser import diagonal, perimeter, total_area
+
+        shapes = [Circle(1), Square(2)]
+        assert total_area(shapes) == sum(shape.area() for shape in shapes)
+        assert perimeter(Square(2)) == 8
+        assert diagonal(Square(3)) == Square(3).diagonal() == math.sqrt(18)
+    finally:
+        remove_files(targets)
+
+
+@cpp2py_tester(
+    "outputargs.hpp",
+    config=Config(
+        output_args={
+            "divmod": {"remainder": None},
+            "minmax": {"lo": None, "hi": None},
+            "cumsum": {"result": "n"},
+            "Scaler::scale": {"result": "n"},
+            "rescaled": {"factor": None},
+        }
+    ),
+)
+def test_output_args():
+    from outputargs import Scaler, cumsum, divmod, minmax, rescaled
+
+    assert divmod(7, 3) == (2, 1)
+    assert minmax(np.array([3.0, 1.0, 5.0]), 3) == (1.0, 5.0)
+
+    values = np.arange(4.0)
+    assert cumsum(values, 4).tolist() == [0.0, 1.0, 3.0, 6.0]
+    out = np.zeros(4)
+    assert cumsum(values, 4, out) is out
+    assert out.tolist() == [0.0, 1.0, 3.0, 6.0]
+    with pytest.raises(ValueError):
+        cumsum(values, 4, np.zeros(2))
+    assert cumsum(np.zeros(0), 0).shape == (0,)
+
+    n, result = Scaler(2.0).scale(values, 4, out)
+    assert n == 4 and result is out
+    assert out.tolist() == [0.0, 2.0, 4.0, 6.0]
+
+    scaler, factor = rescaled(Scaler(2.0), 3.0)
+    assert scaler.factor == factor == 6.0
+
+
+def test_array_fields():
+    class DataConverter(VoidPtrConverter):
+        def _matches(self):
+            return super()._matches() and self.py_argname == "x"
+
+        def real_type(self) -> str:
+            return "double"
+
+    config = Config(
+        registered_converters=[DataConverter],
+        array_fields={
+            "Sparse::p": "ncol + 1",
+            "Sparse::i": "nzmax",
+            "Sparse::x": "nzmax",
+            "Sparse::missing": "nzmax",
+        },
+    )
+
+    @cpp2py_tester("arrayfields.hpp", config=config)
+    def run():
+        from arrayfields import Sparse
+
+        s = Sparse()
+        assert s.p.tolist() == [0, 1, 3]
+        assert s.i.dtype == np.int32 and s.i.tolist() == [0, 0, 1]
+        assert s.missing is None
+        x = s.x
+        x[0] = 10.0  # view of the C++ data
+        assert s.sum() == 15.0
+        del s  # kept alive by the view
+        assert x.tolist() == [10.0, 2.0, 3.0]
+
+    run()
@@ -1,12 +1,22 @@
 import numpy as np
 import pytest
 
+from cpp2py import Config, MapViewConverter, NumericVectorListConverter
 from tools import cpp2py_tester
 
 
 @cpp2py_tester("basictypes.hpp")
 def test_basic_types():
-    from basictypes import A, fun1, helloworld, length, lookup
+    from basictypes import (
+        A,
+        count_strings,
+        erase_first,
+        fun1,
+        helloworld,
+        length,
+        lookup,
+        total_length,
+    )
 
     a = A()
     assert True == a.neg(False)
@@ -24,12 +34,49 @@ def test_basic_types():
     assert fun1(ptr) == 6
 
     assert length("test") == 4
+    assert total_length(3, ["ab", b"cde", "\u00e9"]) == 7  # é is 2 bytes in UTF-8
+    assert total_length(100, ["x"] * 100) == 100  # more than the stack table
+    assert count_strings(("a", "b")) == 2
+    # the C++ side writes to copies of the strings
+    strings = [b"abc", "abc"]
+    assert erase_first(2, strings) == 2 and strings == [b"abc", "abc"]
     assert helloworld() == "hello world"
 
     m = {"test": -1}
     assert lookup(m) == m["test"]
 
 
+@cpp2py_tester(
+    "bytestrings.hpp",
+    config=Config(
+        bytes_strings=["reverse", "countZeros", "greeting", "middle", "Packet::payload"]
+    ),
+)
+def test_bytes_strings():
+    from bytestrings import (
+        Packet,
+        count_zeros,
+        first_word,
+        greeting,
+        middle,
+        reverse,
+    )
+
+    assert reverse(b"\xff\x00ab") == b"ba\x00\xff"
+    assert reverse(bytearray(b"ab")) == b"ba"
+    assert reverse(np.frombuffer(b"xyz", np.uint8)) == b"zyx"
+    assert reverse(b"") == b""
+    assert count_zeros(b"abc") == 3
+    assert greeting() == "h\u00e9llo".encode()
+    assert middle(memoryview(b"[\xfe]")) == b"\xfe"
+    assert first_word("h\u00e9llo world") == "h\u00e9llo"  # str without the setting
+
+    packet = Packet()
+    packet.payload = b"\x00\x01"
+    packet.name = "p"
+    assert packet.payload == b"\x00\x01" and packet.name == "p"
+
+
 @cpp2py_tester("complexarg.hpp")
 def test_complex_arg():
     from complexarg import A, B, C
@@ -50,6 +97,117 @@ def test_fixed_length_array():
     assert to_string([1, 2, 3, 4, 5]) == "[1, 2, 3, 4, 5]"
     pytest.raises(ValueError, to_string, [1, 2, 3, 4])
     pytest.raises(TypeError, to_string, [1, 2, 3, 4, "a"])
+    assert to_string(np.arange(1.0, 6.0)) == "[1, 2, 3, 4, 5]"
+    assert to_string(np.arange(1, 6)) == "[1, 2, 3, 4, 5]"  # other dtype
+    pytest.raises(ValueError, to_string, np.arange(4.0))
+
+
+@cpp2py_tester("fixedarray.hpp", modulename="fixedarray2d")
+def test_fixed_length_array_2d():
+    from fixedarray2d import Grid, trace
+
+    assert trace(np.eye(2)) == 2.0
+    assert trace([[1.0, 0.0], [0.0, 3.0]]) == 4.0
+    pytest.raises(ValueError, trace, np.eye(3))
+
+    g = Grid()
+    g.cells = [[1, 2, 3], [4, 5, 6]]
+    assert g.sum_cells() == 21
+    cells = g.cells
+    assert cells.shape == (2, 3) and cells.dtype == np.int32
+    cells[1, 2] = 10  # view onto the struct
+    assert g.sum_cells() == 25
+    g.origin = np.arange(3.0)
+    assert g.origin.tolist() == [0.0, 1.0, 2.0]
+    del g
+    assert cells.sum() == 25
+
+
+@cpp2py_tester("numericvector.hpp")
+def test_numeric_vector_as_ndarray():
+    from numericvector import Samples, linspace, range
+
+    x = linspace(0.0, 1.0, 5)
+    assert isinstance(x, np.ndarray)
+    assert x.dtype == np.float64
+    assert x.base is not None and not x.flags.owndata
+    np.testing.assert_allclose(x, [0.0, 0.25, 0.5, 0.75, 1.0])
+
+    r = range(4)
+    assert r.dtype == np.intc
+    assert r.tolist() == [0, 1, 2, 3]
+    assert range(0).shape == (0,)
+
+    s = Samples()
+    values = s.get_values()
+    assert values.dtype == np.float32
+    assert values.tolist() == [1.0, 2.0, 3.0]
+    # returning a reference must not steal the member
+    assert s.values.tolist() == [1.0, 2.0, 3.0]
+
+
+@cpp2py_tester("numericvector.hpp", modulename="numericvectorarg")
+def test_numeric_vector_from_buffer():
+    import array
+
+    from numericvectorarg import count, sum
+
+    x = np.arange(6, dtype=np.float64)
+    assert sum(x) == 15.0
+    assert sum(array.array("d", [1.0, 2.0])) == 3.0
+    assert sum(memoryview(x)) == 15.0
+    assert sum(x[::2]) == 6.0  # not contiguous
+    assert sum(x.astype(np.int32)) == 15.0  # other dtype
+    assert sum(np.empty(0)) == 0.0
+    assert sum([1.0, 2.5]) == 3.5
+    assert sum(v for v in (1.0, 2.0)) == 3.0
+    assert count(b"abc") == 3
+
+
+@cpp2py_tester(
+    "numericvector.hpp",
+    modulename="numericvectorlist",
+    config=Config(registered_converters=[NumericVectorListConverter]),
+)
+def test_numeric_vector_as_list():
+    from numericvectorlist import Samples, linspace, make_samples, sum
+
+    assert linspace(0.0, 1.0, 3) == [0.0, 0.5, 1.0]
+    assert Samples().get_values() == [1.0, 2.0, 3.0]
+    assert sum(np.arange(4.0)) == 6.0
+    # other containers keep their conversions
+    assert type(make_samples(2)).__name__ == "SamplesVector"
+
+
+@cpp2py_tester("mapview.hpp", config=Config(registered_converters=[MapViewConverter]))
+def test_map_view():
+    from collections.abc import Mapping
+
+    from mapview import Inventory, squares, sum_values
+
+    values = squares(1000)
+    assert isinstance(values, Mapping)
+    assert len(values) == 1000
+    assert values[30] == 900.0
+    assert 999 in values and 1000 not in values and "a" not in values
+    assert values.get(1000, -1.0) == -1.0
+    with pytest.raises(KeyError):
+        values[-1]
+    assert sorted(values)[:3] == [0, 1, 2]
+    assert dict(squares(3)) == {0: 0.0, 1: 1.0, 2: 4.0}
+    assert squares(3) == {0: 0.0, 1: 1.0, 2: 4.0}
+    assert sum_values(values) == sum(i * i for i in range(1000))
+    assert sum_values({1: 2.0}) == 2.0
+
+    inventory = Inventory()
+    inventory.add("apple", 2)
+    counts = inventory.counts  # views the field
+    inventory.add("pear", 1)
+    assert list(counts.items()) == [("apple", 2), ("pear", 1)]
+    copied = inventory.get_counts()
+    del inventory
+    assert counts["pear"] == 1
+    assert dict(copied) == {"apple": 2, "pear": 1}
 
 
 @cpp2py_tester("vectorofstruct.hpp")
@@ -70,6 +228,33 @@ def test_vector_of_struct():
     assert sum_of_activated_entries(entries) == 15
 
 
+@cpp2py_tester("vectorofstruct.hpp", modulename="structvector")
+def test_returned_vector_of_struct():
+    from structvector import MyStruct, MyStructVector, make_entries
+    from structvector import sum_of_activated_entries
+
+    entries = make_entries(5)
+    assert isinstance(entries, MyStructVector)
+    assert len(entries) == 5
+    assert [e.value for e in entries] == [0, 1, 2, 3, 4]
+    assert sum_of_activated_entries(entries) == 6
+
+    item = entries[-2]
+    item.active = True  # a view of the element
+    assert sum_of_activated_entries(entries) == 9
+    sliced = entries[1:4]
+    assert isinstance(sliced, MyStructVector)
+    assert [e.value for e in sliced] == [1, 2, 3]
+    with pytest.raises(IndexError):
+        entries[5]
+    del entries
+    assert item.value == 3  # the view keeps the vector alive
+
+    a = MyStruct()
+    a.value, a.active = 3, True
+    assert sum_of_activated_entries(MyStructVector([a, a])) == 6
+
+
 @cpp2py_tester("lref.hpp")
 def test_left_reference():
     from lref import A, change_a
@@ -79,3 +264,119 @@ def test_left_reference():
     change_a(a)
     assert a.a == 99
     assert a.b == False
+
+
+@cpp2py_tester("copycount.hpp")
+def test_reference_args_without_copy():
+    from copycount import Big, Holder, by_const_ref, by_ptr, by_ref, by_typedef_ref
+
+    b = Big()
+    b.value = 7
+    Big.reset_copies()
+    assert by_const_ref(b) == 7
+    assert by_ref(b) == 8
+    assert b.value == 8
+    assert by_typedef_ref(b) == 8
+    assert by_ptr(b) == 8
+    h = Holder(b)
+    assert h.peek(b) == 16
+    assert Big.get_copies() == 0
+
+
+@cpp2py_tester("ptrptr.hpp")
+def test_numeric_ptr_ptr():
+    from ptrptr import clear_array, sum_rows
+
+    board = np.ones((100, 3), np.int32)  # more rows than the stack table
+    clear_array(100, 3, board)
+    assert not board.any()
+    pytest.raises(ValueError, clear_array, 2, 2, np.ones((2, 4), np.int32)[:, ::2])
+
+    lengths = np.array([3, 2], np.int32)
+    assert sum_rows(2, lengths, [np.arange(3.0), np.arange(2.0)]) == 4.0
+    assert sum_rows(2, np.array([2, 2], np.int32), np.ones((2, 2))) == 4.0
+
+
+@cpp2py_tester("records.hpp")
+def test_structured_dtypes():
+    from records import Particle, Point, make_particles, shift, sum_x, total_mass
+
+    assert Particle.dtype.names == ("pos", "tag", "mass", "history")
+    assert Particle.dtype.itemsize == 40  # padding after `tag`
+    assert Particle.dtype.fields["mass"][1] == 16
+    assert Point.dtype.names == ("x", "y")
+
+    particles = make_particles(3)
+    records = particles.as_array()
+    assert records["mass"].tolist() == [0.0, 0.5, 1.0]
+    assert records["history"][2].tolist() == [0, 2, 4]
+    assert total_mass(records, 3) == 1.5
+    shift(records, 3, 1.5)  # the records view the vector
+    assert particles[1].pos.x == 2.5
+    pytest.raises(ValueError, total_mass, np.zeros(3), 3)
+
+    p = Particle()
+    p.mass = 2.0
+    assert total_mass(p, 1) == 2.0
+
+    points = np.zeros(3, Point.dtype)
+    points["x"] = [1, 2, 3]
+    assert sum_x(points) == 6
+    assert sum_x([Point(1, 2), Point(3, 4)]) == 4
+
+
+def _sum_masses(particles):
+    return float(particles.as_array()["mass"].sum())
+
+
+@cpp2py_tester("records.hpp")
+def test_shared_arrays():
+    import os
+    import pickle
+    import subprocess
+    import sys
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    from records import Particle, ParticleSharedArray, Vec2SharedArray, total_mass
+
+    particles = ParticleSharedArray(4)
+    try:
+        assert len(particles) == 4 and not particles.readonly
+        records = particles.as_array()
+        assert records.dtype == Particle.dtype
+        records["mass"] = [1.0, 2.0, 3.0, 4.0]
+        particles[0].tag = b"a"[0]
+        assert total_mass(records, 4) == 10.0
+
+        # attached views of the same memory
+        attached = ParticleSharedArray.attach(particles.name)
+        assert attached[3].mass == 4.0 and attached[0].tag == b"a"[0]
+        assert not attached.as_array().flags.writeable
+        # elements of a read-only array are copies
+        element = attached[3]
+        element.mass = 0.0
+        assert attached[3].mass == particles[3].mass == 4.0
+        writable = ParticleSharedArray.attach(particles.name, readonly=False)
+        writable[3].mass = 4.5
+        assert attached[3].mass == 4.5
+        particles[3].mass = 5.0
+        assert attached.as_array()["mass"][3] == 5.0
+        assert pickle.loads(pickle.dumps(particles))[3].mass == 5.0
+        with pytest.raises(ValueError):
+            Vec2SharedArray.attach(particles.name)
+
+        # the workers attach instead of copying
+        with ProcessPoolExecutor(1) as executor:
+            assert executor.submit(_sum_masses, particles).result() == 11.0
+        # nor do unrelated processes attaching to it unlink it when exiting
+        attach = f"import records; records.ParticleSharedArray.attach({particles.name!r})"
+        subprocess.run(
+            [sys.executable, "-c", attach],
+            cwd=os.path.dirname(sys.modules["records"].__file__),
+            check=True,
+        )
+        time.sleep(1)  # its resource tracker exits after it
+        assert ParticleSharedArray.attach(particles.name)[3].mass == 5.0
+    finally:
+        particles.unlink()
@@ -0,0 +1,31 @@
+struct Sparse {
+    long ncol;
+    long nzmax;
+    long* p;
+    int* i;
+    void* x;
+    double* missing;
+
+    Sparse()
+        : ncol(2)
+        , nzmax(3)
+        , missing(nullptr)
+    {
+        p = new long[ncol + 1] { 0, 1, 3 };
+        i = new int[nzmax] { 0, 0, 1 };
+        x = new double[nzmax] { 1.0, 2.0, 3.0 };
+    }
+    ~Sparse()
+    {
+        delete[] p;
+        delete[] i;
+        delete[] static_cast<double*>(x);
+    }
+    double sum()
+    {
+        double res = 0.0;
+        for (long k = 0; k < nzmax; k++)
+            res += static_cast<double*>(x)[k];
+        return res;
+    }
+};
@@ -0,0 +1,41 @@
+#include <chrono>
+#include <stdexcept>
+#include <string>
+
+// 1 once another thread sets *flag, 0 after timeoutMs milliseconds
+int waitForFlag(const int *flag, int timeoutMs)
+{
+    auto deadline = std::chrono::steady_clock::now() + std::chrono::milliseconds(timeoutMs);
+    while (std::chrono::steady_clock::now() < deadline)
+    {
+        if (*static_cast<const volatile int *>(flag) != 0)
+            return 1;
+    }
+    return 0;
+}
+
+double sumSquares(const double *values, int n)
+{
+    double sum = 0;
+    for (int i = 0; i < n; i++)
+        sum += values[i] * values[i];
+    return sum;
+}
+
+int echoLength(const std::string &s) { return s.size(); }
+
+class Worker
+{
+public:
+    int base = 1;
+
+    int scale(int x) const { return base * x; }
+    Worker shifted(int offset) const
+    {
+        Worker worker;
+        worker.base = base + offset;
+        return worker;
+    }
+    void fail() const { throw std::runtime_error("failed"); }
+    static int twice(int x) { return 2 * x; }
+};
@@ -38,6 +38,29 @@ int length(char const* const input)
     return i;
 }
 
+int totalLength(int argc, char** argv)
+{
+    int total = 0;
+    for (int i = 0; i < argc; i++)
+        total += length(argv[i]);
+    return argv[argc] == nullptr ? total : -1;
+}
+
+int eraseFirst(int argc, char** argv)
+{
+    for (int i = 0; i < argc; i++)
+        argv[i][0] = '_';
+    return argc;
+}
+
+int countStrings(const char** strings)
+{
+    int n = 0;
+    while (strings[n] != nullptr)
+        n++;
+    return n;
+}
+
 char const* helloworld() { return "hello world"; }
 
 int lookup(std::map<std::string, int>& m) { return m["test"]; }
\ No newline at end of file
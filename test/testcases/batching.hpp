@@ -0,0 +1,28 @@
+#include <vector>
+
+class Shape
+{
+public:
+    virtual ~Shape() {}
+    virtual double area() const = 0;
+};
+
+class Square : public Shape
+{
+public:
+    double side;
+    int id;
+
+    Square(double side = 1.0, int id = 0) : side(side), id(id) {}
+    double area() const override { return side * side; }
+    bool isUnit() const { return side == 1.0; }
+    double scaled(double factor) const { return side * factor; }
+};
+
+std::vector<Square> makeSquares(int n)
+{
+    std::vector<Square> squares;
+    for (int i = 0; i < n; i++)
+        squares.emplace_back(i, i);
+    return squares;
+}
@@ -0,0 +1,24 @@
+#include <cstring>
+#include <string>
+#include <string_view>
+
+std::string reverse(const std::string &data) { return std::string(data.rbegin(), data.rend()); }
+
+size_t countZeros(const char *data)
+{
+    // stops at the terminating zero
+    return std::strlen(data);
+}
+
+const char *greeting() { return "h\xc3\xa9llo"; }
+
+std::string_view middle(std::string_view text) { return text.substr(1, text.size() - 2); }
+
+std::string_view firstWord(std::string_view text) { return text.substr(0, text.find(' ')); }
+
+class Packet
+{
+public:
+    std::string payload;
+    std::string name;
+};
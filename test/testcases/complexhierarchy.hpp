@@ -29,4 +29,28 @@ public:
 
     virtual int bMethod() { return 5; }
 };
-}
\ No newline at end of file
+}
+
+/*
+Left  <---- Both
+Right <----
+*/
+class Left {
+public:
+    int l;
+    virtual ~Left() { }
+};
+
+class Right {
+public:
+    int r;
+};
+
+class Both : public Left, public Right {
+public:
+    int both;
+};
+
+int readRight(const Right& right) { return right.r; }
+
+int readBase2(Base2* base2) { return base2->b; }
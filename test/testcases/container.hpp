@@ -0,0 +1,50 @@
+#include <cstddef>
+#include <string>
+#include <vector>
+
+class Samples
+{
+public:
+    Samples(int n) : values(n)
+    {
+        for (int i = 0; i < n; i++)
+            values[i] = 0.5 * i;
+    }
+    size_t size() const { return values.size(); }
+    double &operator[](size_t i) { return values[i]; }
+    double *data() { return values.data(); }
+    double *begin() { return values.data(); }
+    double *end() { return values.data() + values.size(); }
+
+private:
+    std::vector<double> values;
+};
+
+class Words
+{
+public:
+    std::vector<std::string> words;
+
+    int size() const { return words.size(); }
+    std::string operator[](int i) const { return words[i]; }
+    const std::string *begin() const { return words.data(); }
+    const std::string *end() const { return words.data() + words.size(); }
+};
+
+struct Point
+{
+    int x, y;
+};
+
+class Polyline
+{
+public:
+    void append(int x, int y) { points.push_back({x, y}); }
+    size_t size() const { return points.size(); }
+    Point &operator[](size_t i) { return points[i]; }
+    Point *begin() { return points.data(); }
+    Point *end() { return points.data() + points.size(); }
+
+private:
+    std::vector<Point> points;
+};
@@ -0,0 +1,44 @@
+class Big {
+public:
+    int value;
+    static int copies;
+
+    Big()
+        : value(0)
+    {
+    }
+    Big(const Big& other)
+        : value(other.value)
+    {
+        copies++;
+    }
+    static int getCopies() { return copies; }
+    static void resetCopies() { copies = 0; }
+};
+
+int Big::copies = 0;
+
+typedef const Big& BigCRef;
+
+int byConstRef(const Big& b) { return b.value; }
+
+int byRef(Big& b)
+{
+    b.value++;
+    return b.value;
+}
+
+int byTypedefRef(BigCRef b) { return b.value; }
+
+int byPtr(const Big* b) { return b->value; }
+
+class Holder {
+    const Big& big;
+
+public:
+    Holder(const Big& big)
+        : big(big)
+    {
+    }
+    int peek(const Big& other) const { return big.value + other.value; }
+};
@@ -13,3 +13,19 @@ std::string toString(double myArray[5])
     ss << "]";
     return ss.str();
 }
+
+double trace(double matrix[2][2]) { return matrix[0][0] + matrix[1][1]; }
+
+struct Grid {
+    double origin[3];
+    int cells[2][3];
+
+    int sumCells()
+    {
+        int res = 0;
+        for (unsigned int i = 0; i < 2; i++)
+            for (unsigned int j = 0; j < 3; j++)
+                res += cells[i][j];
+        return res;
+    }
+};
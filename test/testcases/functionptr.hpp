@@ -19,3 +19,24 @@ struct A {
     void (*error_handler)(int status, const char* file,
         int line, const char* message);
 };
+
+int apply(int (*op)(int, int), int a, int b) { return op(a, b); }
+
+double reduce(const double* values, int n, double init, double (*op)(double, double))
+{
+    for (int i = 0; i < n; i++)
+        init = op(init, values[i]);
+    return init;
+}
+
+void greet(const char* name, void (*callback)(const char* message))
+{
+    callback(name);
+    callback(nullptr);
+}
+
+static int (*storedOp)(int, int) = nullptr;
+
+void storeOp(int (*op)(int, int)) { storedOp = op; }
+
+int applyStored(int a, int b) { return storedOp(a, b); }
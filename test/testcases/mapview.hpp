@@ -0,0 +1,28 @@
+#include <map>
+#include <string>
+#include <unordered_map>
+
+std::unordered_map<int, double> squares(int n)
+{
+    std::unordered_map<int, double> result;
+    for (int i = 0; i < n; i++)
+        result[i] = i * i;
+    return result;
+}
+
+double sumValues(const std::unordered_map<int, double> &values)
+{
+    double total = 0;
+    for (const auto &item : values)
+        total += item.second;
+    return total;
+}
+
+class Inventory
+{
+public:
+    std::map<std::string, int> counts;
+
+    void add(const std::string &name, int count) { counts[name] += count; }
+    const std::map<std::string, int> &getCounts() const { return counts; }
+};
@@ -0,0 +1,43 @@
+#include <vector>
+
+std::vector<double> linspace(double start, double stop, int num)
+{
+    std::vector<double> res(num);
+    for (int i = 0; i < num; i++) {
+        res[i] = start + (stop - start) * i / (num - 1);
+    }
+    return res;
+}
+
+std::vector<int> range(int n)
+{
+    std::vector<int> res;
+    for (int i = 0; i < n; i++) {
+        res.push_back(i);
+    }
+    return res;
+}
+
+double sum(const std::vector<double>& values)
+{
+    double res = 0.0;
+    for (double v : values) {
+        res += v;
+    }
+    return res;
+}
+
+long long count(std::vector<unsigned char> bytes) { return bytes.size(); }
+
+class Samples {
+public:
+    std::vector<float> values;
+
+    Samples()
+        : values({ 1.0f, 2.0f, 3.0f })
+    {
+    }
+    std::vector<float>& getValues() { return values; }
+};
+
+std::vector<Samples> makeSamples(int n) { return std::vector<Samples>(n); }
@@ -0,0 +1,51 @@
+int divmod(int a, int b, int& remainder)
+{
+    remainder = a % b;
+    return a / b;
+}
+
+void minmax(const double* values, int n, double* lo, double* hi)
+{
+    *lo = *hi = values[0];
+    for (int i = 1; i < n; i++) {
+        if (values[i] < *lo)
+            *lo = values[i];
+        if (values[i] > *hi)
+            *hi = values[i];
+    }
+}
+
+void cumsum(const double* values, int n, double* result)
+{
+    double acc = 0.0;
+    for (int i = 0; i < n; i++) {
+        acc += values[i];
+        result[i] = acc;
+    }
+}
+
+class Scaler {
+public:
+    double factor;
+
+    Scaler()
+        : factor(1.0)
+    {
+    }
+    Scaler(double factor)
+        : factor(factor)
+    {
+    }
+    int scale(const double* values, int n, double* result)
+    {
+        for (int i = 0; i < n; i++)
+            result[i] = values[i] * factor;
+        return n;
+    }
+};
+
+Scaler rescaled(const Scaler& scaler, double by, double& factor)
+{
+    factor = scaler.factor * by;
+    return Scaler(factor);
+}
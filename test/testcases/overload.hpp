@@ -1,3 +1,5 @@
+#include <string>
+
 double plusOne(double d) { return d + 1.0; }
 
 int plusOne(int d) { return d - 1; }
@@ -7,4 +9,24 @@ public:
     double plusOne(double d) { return d + 1.0; }
 
     int plusOne(int d) { return d - 1.0; }
-};
\ No newline at end of file
+};
+
+class B {
+public:
+    B() { }
+    B(int size, double fill = 0.0) { }
+};
+
+double total(const double* values) { return values[0] + values[1]; }
+
+int total(const int* values) { return values[0] * values[1]; }
+
+std::string describe(const A& a) { return "A"; }
+
+std::string describe(const B& b) { return "B"; }
+
+std::string describe(int i, int j = 0) { return std::to_string(i + j); }
+
+std::string typeOf(bool b) { return "bool"; }
+
+std::string typeOf(double d) { return "double"; }
@@ -0,0 +1,65 @@
+#include <cmath>
+#include <string>
+
+struct Vec3
+{
+    double x;
+    double y;
+    double z;
+};
+
+class Body
+{
+public:
+    double mass;
+    std::string name;
+
+    Body(double mass = 1.0) : mass(mass) {}
+};
+
+double distance(double x, double y)
+{
+    return std::sqrt(x * x + y * y);
+}
+
+float dot(const float* a, const float* b)
+{
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2];
+}
+
+double norm(const Vec3& v)
+{
+    return std::sqrt(v.x * v.x + v.y * v.y + v.z * v.z);
+}
+
+void scale(Vec3* v, double factor)
+{
+    v->x *= factor;
+    v->y *= factor;
+    v->z *= factor;
+}
+
+double weight(const Body& body, double g)
+{
+    return body.mass * g;
+}
+
+void grow(Body* body, double mass)
+{
+    body->mass += mass;
+}
+
+void increment(int& value)
+{
+    value++;
+}
+
+bool isPositive(double x)
+{
+    return x > 0;
+}
+
+std::string label(int i)
+{
+    return std::to_string(i);
+}
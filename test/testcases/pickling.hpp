@@ -0,0 +1,45 @@
+#include <string>
+#include <vector>
+
+// trivially copyable, pickled as its bytes
+struct Grid
+{
+    int rows;
+    int cols;
+    double cells[256];
+};
+
+// pickled field by field
+class Player
+{
+public:
+    std::string name;
+    std::vector<int> moves;
+    double weights[4];
+    Grid board;
+
+    Player(const std::string &name = "anonymous") : name(name) {}
+};
+
+class Champion : public Player
+{
+public:
+    int titles = 0;
+};
+
+// the private state can not be pickled
+class Session
+{
+public:
+    int id = 0;
+
+private:
+    int secret = 0;
+};
+
+// its fields can not be pickled
+class Cursor : public Player
+{
+public:
+    const int position = 0;
+};
@@ -23,6 +23,7 @@ public:
         : size(size) {};
     double area() const { return size * size; };
     double perimeter() const { return 4 * size; };
+    double diagonal() const { return std::sqrt(2 * size * size); };
 };
 
 double getArea(Shape* shape)
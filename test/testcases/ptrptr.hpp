@@ -0,0 +1,15 @@
+void clearArray(int M, int N, int** board)
+{
+    for (int i = 0; i < M; i++)
+        for (int j = 0; j < N; j++)
+            board[i][j] = 0;
+}
+
+double sumRows(int M, const int* lengths, const double** rows)
+{
+    double res = 0.0;
+    for (int i = 0; i < M; i++)
+        for (int j = 0; j < lengths[i]; j++)
+            res += rows[i][j];
+    return res;
+}
@@ -0,0 +1,61 @@
+#include <vector>
+
+struct Vec2 {
+    float x;
+    float y;
+};
+
+struct Particle {
+    Vec2 pos;
+    char tag;
+    double mass;
+    int history[3];
+};
+
+class Point {
+public:
+    int x;
+    int y;
+
+    Point(int x, int y)
+        : x(x)
+        , y(y)
+    {
+    }
+};
+
+double totalMass(const Particle* particles, int n)
+{
+    double res = 0.0;
+    for (int i = 0; i < n; i++)
+        res += particles[i].mass;
+    return res;
+}
+
+void shift(Particle* particles, int n, float dx)
+{
+    for (int i = 0; i < n; i++)
+        particles[i].pos.x += dx;
+}
+
+std::vector<Particle> makeParticles(int n)
+{
+    std::vector<Particle> res(n);
+    for (int i = 0; i < n; i++) {
+        res[i].pos.x = i;
+        res[i].pos.y = -i;
+        res[i].tag = 'a' + i;
+        res[i].mass = 0.5 * i;
+        for (int j = 0; j < 3; j++)
+            res[i].history[j] = i * j;
+    }
+    return res;
+}
+
+int sumX(const std::vector<Point>& points)
+{
+    int res = 0;
+    for (const Point& p : points)
+        res += p.x;
+    return res;
+}
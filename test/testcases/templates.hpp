@@ -0,0 +1,60 @@
+#include <vector>
+
+template <typename T>
+T minusOne(T t)
+{
+    return t - T(1);
+}
+
+template <typename T>
+T sum(const T* values, int n)
+{
+    T res = T(0);
+    for (int i = 0; i < n; i++)
+        res += values[i];
+    return res;
+}
+
+namespace geometry
+{
+template <typename T, int N>
+class Vector
+{
+public:
+    T data[N];
+
+    Vector(T value = T(0))
+    {
+        for (int i = 0; i < N; i++)
+            data[i] = value;
+    }
+
+    T norm1() const
+    {
+        T res = T(0);
+        for (int i = 0; i < N; i++)
+            res += data[i] < 0 ? -data[i] : data[i];
+        return res;
+    }
+
+    std::vector<T> values() const
+    {
+        return std::vector<T>(data, data + N);
+    }
+
+    template <typename V>
+    V cast(V v) const
+    {
+        return v;
+    }
+};
+
+template <typename T>
+T dot(const T* a, const T* b, int n)
+{
+    T res = T(0);
+    for (int i = 0; i < n; i++)
+        res += a[i] * b[i];
+    return res;
+}
+}
@@ -44,4 +44,5 @@ public:
         return getMa();
     }
     int m_d;
-};
\ No newline at end of file
+};
+int readMa(const A& a) { return a.m_a; }
@@ -16,6 +16,8 @@ SETUPPY_NAME = "setup_test.py"
 def remove_files(filenames):
     """Remove files if they exist."""
     for f in filenames:
+        if f is None:
+            continue
         if os.path.exists(f):
             os.remove(f)
         else:
@@ -32,6 +34,26 @@ def full_path(filenames: List[str]):
     return paths
 
 
+def build_cython_module(modulename: str, source: str):
+    """Build a Cython module that cimports generated wrappers."""
+    pyx_name = f"{modulename}.pyx"
+    setup_name = f"setup_{modulename}.py"
+    with open(pyx_name, "w", encoding="utf8") as f:
+        f.write(source)
+    with open(setup_name, "w", encoding="utf8") as f:
+        f.write(
+            "from Cython.Build import cythonize\n"
+            "from setuptools import Extension, setup\n"
+            f"setup(ext_modules=cythonize([Extension('{modulename}', ['{pyx_name}'], "
+            "language='c++', extra_compile_args=['-std=c++17'])], language_level=3))\n"
+        )
+    try:
+        run_setup(setup_name)
+    finally:
+        remove_files([pyx_name, setup_name, pyx_name.replace(".pyx", ".cpp")])
+    return [modulename + ".*.so"]
+
+
 def cpp2py_tester(
     headers,
     modulename=None,
@@ -81,6 +103,7 @@ def cpp2py_tester(
                         results.header_name,
                         results.setup_name,
                         results.stub_name,
+                        results.api_name,
                         results.source_name.replace(".pyx", ".cpp"),
                         results.source_name.replace(".pyx", ".*.so"),
                     ]